@@ -1,16 +1,16 @@
 """ This is for setting attribute values in order.
 
-Last modified date: 2019/09/11
+Last modified date: 2026/10/18
 
 Created by Seongju Woo.
 """
 import abc
-import itertools as it
 from fwig.tools import attributetools as at
 
-def _get_penpair_values(contour):
-    return [int(at.get_attr(point, 'penPair')[1:-1]) for point in contour.points \
-                                                     if point.type != 'offcurve']
+def _get_penpair_values(glyph):
+    table = at.get_penpair_table(glyph)
+    at.check_penpair_table(table)
+    return table['pair']
 
 def get_max_penpair(glyph):
     """ Gets the maximum value of penPair attributes from glyph.
@@ -22,7 +22,7 @@ def get_max_penpair(glyph):
     Returns:
         maximum value of penPair:: str
     """
-    return max(it.chain(*[_get_penpair_values(contour) for contour in glyph.contours]))
+    return int(_get_penpair_values(glyph).max())
 
 def get_min_penpair(glyph):
     """ Gets the minimum value of penPair attributes from glyph.
@@ -34,7 +34,7 @@ def get_min_penpair(glyph):
     Returns:
         minimum value of penPair:: str
     """
-    return min(it.chain(*[_get_penpair_values(contour) for contour in glyph.contours]))
+    return int(_get_penpair_values(glyph).min())
 
 
 class Ordering:
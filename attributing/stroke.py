@@ -1,35 +1,29 @@
 """ This is for adding stroke attribute at points.
 
-Last modified date: 2019/12/11
+Last modified date: 2026/10/18
 
 Created by Seongju Woo.
 """
-from fwig.tools import attributetools as at
+from functools import partial
+from fwig.tools import attributetools as at, windingtools as wt
 
 class _PairError(Exception):
     def __init__(self, e):
         super().__init__(e)
 
 def _get_penpair_dict(contour):
-    penpair_dict = {}
-    for point in contour.points:
-        if point.type == 'offcurve':
-            continue
-        penpair = at.get_attr(point, 'penPair')[1:-1]
-        if penpair in penpair_dict:
-            penpair_dict[penpair].append(point)
-        else:
-            penpair_dict[penpair] = [point]
+    penpair_dict = at.get_penpair_dict(contour)
     if not all(map(lambda x: len(x) == 2, penpair_dict.values())):
         raise _PairError('Pair is not exist.')
     return penpair_dict
 
+def _is_inside_contours(point, contour_indexes):
+    return bool(wt.inside_contours(point.glyph, [point.position])[0, contour_indexes].any())
+
 def _get_stroke_dict(contours):
     stroke_dict = {'begin':[], 'end':[]}
     criteria_1 = lambda p: at.get_attr(p, 'dependX') is None and \
                            at.get_attr(p, 'dependY') is None
-    criteria_2 = lambda p: any([contour.pointInside(p.position) for contour in contours
-                                                                if not contour is p.contour])
     candidates = []
     for contour in contours:
         try:
@@ -42,9 +36,10 @@ def _get_stroke_dict(contours):
             if len(points) == 2 and (idx_diff == 1 or idx_diff == len(contour.points)-1):
                 stroke_parts.append(points)
         if len(stroke_parts) == 2:
-            candidates.append(stroke_parts)
-    for candidate in candidates:
-        cand_1, cand_2 = candidate
+            other_indexes = [other.index for other in contours if other is not contour]
+            candidates.append((stroke_parts, other_indexes))
+    for (cand_1, cand_2), other_indexes in candidates:
+        criteria_2 = partial(_is_inside_contours, contour_indexes=other_indexes)
         if (cand_1[0].y + cand_1[1].y) / 2 > (cand_2[0].y + cand_2[1].y) / 2:
             if all(map(criteria_1, cand_1)) and not any(map(criteria_2, cand_1)):
                 stroke_dict['begin'].extend(cand_1)
@@ -0,0 +1,85 @@
+""" Benchmarks the point name parser of attributetools.
+
+Compares name2dict with the former JSON based implementation and dict2name
+with the former f-string join, checks that they give the same results and
+that names with quotes and backslashes round-trip. Names
+are read from the .glif files given as arguments(examples/test.xml by
+default) and from synthetic names like the ones our attributing passes
+write.
+
+Usage:
+    python benchmarks/bench_codec.py [GLIF_PATH ...]
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
+import os
+import sys
+import json
+import timeit
+from xml.etree import ElementTree as et
+from fwig.tools import attributetools as at
+
+_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'examples', 'test.xml')
+
+def _json_name2dict(name):
+    if name is None:
+        return {}
+    return json.loads('{' + name.replace("'", '"') + '}')
+
+def _join_dict2name(dict_attributes):
+    return ','.join([f"'{k}':'{v}'" for k, v in dict_attributes.items()])
+
+def read_names(paths):
+    names = []
+    for path in paths:
+        for point in et.parse(path).getroot().iter('point'):
+            if point.get('name') is not None:
+                names.append(point.get('name'))
+    return names
+
+def synthetic_names(count=1000):
+    names = []
+    for i in range(count):
+        attributes = {'penPair': f"z{i % 40 + 1}{'lr'[i % 2]}"}
+        if i % 3 == 0:
+            attributes['dependX'] = f"z{i % 17 + 1}r"
+        if i % 5 == 0:
+            attributes['stroke'] = 'begin'
+        if i % 7 == 0:
+            attributes.update({'sound': 'first', 'char': '1', 'formType': '2'})
+        names.append(_join_dict2name(attributes))
+    return names + ["'serif':1", "'penPair': 'z1r'", '', None]
+
+def check(names):
+    for name in names:
+        expected = _json_name2dict(name)
+        if at.name2dict(name) != expected:
+            raise AssertionError(f'name2dict({name!r}) differs from JSON result')
+        if name and name == _join_dict2name(expected) and at.dict2name(expected) != name:
+            raise AssertionError(f'dict2name({expected!r}) does not round-trip')
+    # Quotes and backslashes, which the former serializer could not write.
+    for attributes in ({'note': "it's"}, {'path': 'a\\b'}, {"k'ey": "'\\'"}):
+        if at.name2dict(at.dict2name(attributes)) != attributes:
+            raise AssertionError(f'dict2name({attributes!r}) does not round-trip')
+
+def bench(func, values, number):
+    return min(timeit.repeat(lambda: [func(value) for value in values],
+                             number=number, repeat=5)) / (number*len(values))
+
+def main(paths):
+    names = read_names(paths) + synthetic_names()
+    check(names)
+    print(f'{len(names)} names checked, results are identical.')
+    before = bench(_json_name2dict, names, 20)
+    after = bench(at.name2dict, names, 20)
+    print(f'name2dict: {before*1e6:.3f} us -> {after*1e6:.3f} us ({before/after:.1f}x)')
+    dicts = [at.name2dict(name) for name in names]
+    before = bench(_join_dict2name, dicts, 20)
+    after = bench(at.dict2name, dicts, 20)
+    print(f'dict2name: {before*1e6:.3f} us -> {after*1e6:.3f} us ({before/after:.1f}x)')
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or [_EXAMPLE])
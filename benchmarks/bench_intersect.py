@@ -0,0 +1,78 @@
+""" Benchmarks the line and segment intersection kernel of intersecttools.
+
+Intersects random lines with random cubic and linear segments by
+intersecttools.intersect_lines() and by bezier.Curve.intersect() one pair at
+a time, checks that both find the same intersections and compares the times.
+
+Usage:
+    python benchmarks/bench_intersect.py [LINE_COUNT] [SEGMENT_COUNT]
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
+import sys
+import time
+import numpy as np
+import bezier
+from fwig.tools import intersecttools as it
+
+def random_lines(count, random):
+    centers = random.uniform(0, 1000, (count, 2))
+    angles = random.uniform(0, np.pi, count)
+    directions = np.stack((np.cos(angles), np.sin(angles)), axis=1) * 1000
+    return np.stack((centers - directions, centers + directions), axis=1)
+
+def random_segments(count, random):
+    starts = random.uniform(0, 1000, (count, 1, 2))
+    cubics = starts + random.uniform(-300, 300, (count, 4, 2)) * [[0], [1], [1], [1]]
+    return [cubic if i % 4 else cubic[[0, 3]] for i, cubic in enumerate(cubics)]
+
+def bezier_intersections(lines, segments):
+    s_values = {}
+    curves = [bezier.Curve(np.asfortranarray(segment.T), degree=len(segment)-1)
+              for segment in segments]
+    for i, line in enumerate(lines):
+        line = bezier.Curve(np.asfortranarray(line.T), degree=1)
+        for j, curve in enumerate(curves):
+            intersections = curve.intersect(line)
+            if intersections.shape[1]:
+                s_values[i, j] = np.sort(intersections[0])
+    return s_values
+
+def check(lines, segments, expected, tolerance=1e-6):
+    result = it.intersect_lines(lines, segments)
+    found = {}
+    for i, j, s_value in zip(result.lines, result.segments, result.s_values):
+        found.setdefault((i, j), []).append(s_value)
+    errors = []
+    for key in set(expected) | set(found):
+        s_values_1, s_values_2 = expected.get(key, []), found.get(key, [])
+        if len(s_values_1) != len(s_values_2):
+            raise AssertionError(f'line {key[0]}, segment {key[1]}: bezier found '
+                                 f'{list(s_values_1)}, intersect_lines found {s_values_2}')
+        errors += list(np.abs(np.asarray(s_values_1) - s_values_2))
+    error = max(errors, default=0)
+    if error > tolerance:
+        raise AssertionError(f'Parameters differ by {error}.')
+    return len(errors), error
+
+def main(line_count=50, segment_count=200):
+    random = np.random.default_rng(0)
+    lines = random_lines(line_count, random)
+    segments = random_segments(segment_count, random)
+
+    start = time.perf_counter()
+    expected = bezier_intersections(lines, segments)
+    before = time.perf_counter() - start
+    start = time.perf_counter()
+    it.intersect_lines(lines, segments)
+    after = time.perf_counter() - start
+
+    count, error = check(lines, segments, expected)
+    print(f'{line_count} lines x {segment_count} segments: {count} intersections, '
+          f'largest parameter difference {error:.2e}.')
+    print(f'intersect: {before*1e3:.1f} ms -> {after*1e3:.1f} ms ({before/after:.1f}x)')
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
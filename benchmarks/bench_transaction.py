@@ -0,0 +1,85 @@
+""" Benchmarks attribute edits in AttributeTransaction.
+
+Checks that attributes and penPair tables read inside a transaction follow
+the staged changes, that commit and rollback leave the glyph and its cached
+tables consistent, and that nested transactions commit into the enclosing
+one. Then times a tagging pass over examples/test.xml with and without a
+transaction.
+
+Usage:
+    python benchmarks/bench_transaction.py
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
+import timeit
+from fontParts.fontshell import RFont
+from fwig.tools import attributetools as at
+from suite import example_glyph
+
+def _first_point(glyph):
+    return glyph.contours[0].points[0]
+
+def _check(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+def check_read_back():
+    glyph = example_glyph(RFont())
+    point = _first_point(glyph)
+    old_penpair = at.get_attr(point, 'penPair')
+    at.get_penpair_table(glyph)
+    with at.AttributeTransaction(glyph):
+        at.set_attr(point, 'penPair', 'z777l')
+        _check(at.get_attr(point, 'penPair') == 'z777l', 'get_attr does not see staged value')
+        _check(at.get_penpair_table(glyph)['pair'].max() == 777,
+               'get_penpair_table does not see staged value')
+        _check('777' in at.get_penpair_dict(glyph), 'get_penpair_dict does not see staged value')
+        _check(point.name == f"'penPair':'{old_penpair}'", 'name is written before commit')
+    _check(point.name == "'penPair':'z777l'", 'name is not written on commit')
+    _check('777' in at.get_penpair_dict(glyph), 'penPair dict is stale after commit')
+
+def check_rollback():
+    glyph = example_glyph(RFont())
+    point = _first_point(glyph)
+    old_name = point.name
+    try:
+        with at.AttributeTransaction(glyph):
+            with at.AttributeTransaction(glyph):
+                at.set_attr(point, 'penPair', 'z777l')
+            _check('777' in at.get_penpair_dict(glyph), 'inner commit is not seen by outer')
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    _check(point.name == old_name, 'outer rollback does not undo inner commit')
+    _check('777' not in at.get_penpair_dict(glyph), 'penPair dict is stale after rollback')
+
+def _tag(glyph):
+    for contour in glyph.contours:
+        for point in contour.points:
+            if point.type != 'offcurve':
+                at.add_attr(point, 'stroke', 'begin')
+                at.add_attr(point, 'sound', 'first')
+                at.set_attr(point, 'sound', 'final')
+
+def _tag_in_transaction(glyph):
+    with at.AttributeTransaction(glyph):
+        _tag(glyph)
+
+def bench(function, number=20):
+    glyphs = [example_glyph(RFont()) for _ in range(number)]
+    glyphs_iter = iter(glyphs)
+    return min(timeit.repeat(lambda: function(next(glyphs_iter)), number=1,
+                             repeat=number))
+
+def main():
+    check_read_back()
+    check_rollback()
+    print('Reads inside transactions, commit and rollback are consistent.')
+    before = bench(_tag)
+    after = bench(_tag_in_transaction)
+    print(f'tagging pass: {before*1e3:.3f} ms -> {after*1e3:.3f} ms ({before/after:.1f}x)')
+
+if __name__ == '__main__':
+    main()
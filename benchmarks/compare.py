@@ -0,0 +1,55 @@
+""" Compares two result files of suite.py.
+
+Prints the time of each benchmark in both runs and their ratio. Benchmarks
+that got slower than the threshold are marked, and the exit status is 1 if
+there is any of them.
+
+Usage:
+    python benchmarks/compare.py BEFORE.json AFTER.json [-t THRESHOLD]
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
+import sys
+import json
+import argparse
+
+def load(path):
+    with open(path) as result_file:
+        return json.load(result_file)['results']
+
+def compare(before, after, threshold=1.1):
+    """ Returns rows of (name, before seconds, after seconds, ratio, is_slower).
+
+    Seconds are None if the benchmark is missing or failed in the run, and
+    the ratio(after / before) is None if any of them is None.
+    """
+    rows = []
+    for name in list(before) + [name for name in after if name not in before]:
+        seconds_1 = before.get(name, {}).get('seconds')
+        seconds_2 = after.get(name, {}).get('seconds')
+        ratio = seconds_2 / seconds_1 if seconds_1 and seconds_2 is not None else None
+        rows.append((name, seconds_1, seconds_2, ratio, ratio is not None and ratio > threshold))
+    return rows
+
+def _format(seconds):
+    return f'{seconds*1e3:10.3f} ms' if seconds is not None else f'{"-":>13s}'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compares two benchmark results.')
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('-t', '--threshold', type=float, default=1.1,
+                        help='after/before ratio regarded as slower(default is 1.1)')
+    args = parser.parse_args(argv)
+
+    rows = compare(load(args.before), load(args.after), args.threshold)
+    for name, seconds_1, seconds_2, ratio, is_slower in rows:
+        ratio = f'{ratio:6.2f}x' if ratio is not None else f'{"-":>7s}'
+        print(f'{name:40s} {_format(seconds_1)} {_format(seconds_2)} {ratio}'
+              + ('  slower' if is_slower else ''))
+    return int(any(row[-1] for row in rows))
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
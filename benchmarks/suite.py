@@ -0,0 +1,234 @@
+""" Micro-benchmarks of fwig geometry and attribute primitives.
+
+Runs headless on fontParts' fontshell objects, so RoboFont is not needed.
+Glyphs are read from examples/test.xml with synthetic penPair names, and
+synthetic glyphs of overlapping stems and of a stem across a circle are
+drawn for overlap and fitting.
+Results are written as JSON. Compare two result files with compare.py.
+
+Usage:
+    python benchmarks/suite.py [-o OUTPUT] [-n NUMBER] [-r REPEAT] [NAME ...]
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import traceback
+import numpy as np
+from fontParts.fontshell import RFont
+from fontTools.ufoLib.glifLib import readGlyphFromString
+from fwig.tools import attributetools as at, derivativetools as dt, extendtools as et, \
+                       appendtools as apt, overlap, glyphcache, beziertools as bt, \
+                       intersecttools as it, windingtools as wt, plot, glif
+from fwig.preprocessing import fitter
+from bench_codec import synthetic_names
+
+_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'examples', 'test.xml')
+
+def add_penpair_names(glyph):
+    """ Names on-curve points of each contour as pairs from both ends. """
+    number = 1
+    for contour in glyph.contours:
+        on_curves = [point for point in contour.points if point.type != 'offcurve']
+        half = len(on_curves) // 2
+        for i, point in enumerate(on_curves):
+            side = 'l' if i < half else 'r'
+            point.name = at.dict2name({'penPair': f'z{number + min(i, len(on_curves)-1-i)}{side}'})
+        number += half
+
+def example_glyph(font, path=_EXAMPLE):
+    glyph = font.newGlyph(os.path.splitext(os.path.basename(path))[0])
+    with open(path) as glif:
+        readGlyphFromString(glif.read(), glyph, glyph.getPointPen())
+    add_penpair_names(glyph)
+    return glyph
+
+def _draw_stem(pen, x, y, width, height):
+    # A stem with rounded ends, four curves and two lines.
+    radius = width / 2
+    kappa = radius * 0.5523
+    pen.moveTo((x, y + radius))
+    pen.curveTo((x, y + radius - kappa), (x + radius - kappa, y), (x + radius, y))
+    pen.curveTo((x + radius + kappa, y), (x + width, y + radius - kappa), (x + width, y + radius))
+    pen.lineTo((x + width, y + height - radius))
+    pen.curveTo((x + width, y + height - radius + kappa), (x + radius + kappa, y + height),
+                (x + radius, y + height))
+    pen.curveTo((x + radius - kappa, y + height), (x, y + height - radius + kappa),
+                (x, y + height - radius))
+    pen.closePath()
+
+def synthetic_glyph(font, name, stem_count=6):
+    """ Draws crossing vertical and horizontal stems. """
+    glyph = font.newGlyph(name)
+    glyph.width = 1000
+    pen = glyph.getPen()
+    for i in range(stem_count):
+        if i % 2:
+            _draw_stem(pen, 100 + 60*i, 80, 80, 800)
+        else:
+            _draw_stem(pen, 80 + 30*i, 150 + 110*i, 800, 70)
+    add_penpair_names(glyph)
+    return glyph
+
+def fitting_glyph(font, name='fitting'):
+    """ Draws a circle and a stem across it, to fit the stem to the circle. """
+    glyph = font.newGlyph(name, clear=True)
+    glyph.width = 1000
+    pen = glyph.getPen()
+    center, radius = 500, 300
+    kappa = radius * 0.5523
+    pen.moveTo((center - radius, center))
+    pen.curveTo((center - radius, center + kappa), (center - kappa, center + radius),
+                (center, center + radius))
+    pen.curveTo((center + kappa, center + radius), (center + radius, center + kappa),
+                (center + radius, center))
+    pen.curveTo((center + radius, center - kappa), (center + kappa, center - radius),
+                (center, center - radius))
+    pen.curveTo((center - kappa, center - radius), (center - radius, center - kappa),
+                (center - radius, center))
+    pen.closePath()
+    _draw_stem(pen, 380, 60, 90, 880)
+    add_penpair_names(glyph)
+    return glyph
+
+def _curves(contour):
+    points = contour.points
+    return [[points[(segment.end + i) % len(points)] for i in range(-3, 1)]
+            for segment in bt.get_segments(contour) if segment.degree == 3]
+
+def _benchmarks():
+    """ Returns {name: (setup, function)}. function(state) is timed, and
+    setup() makes a fresh state for each call if it is not None.
+    """
+    font = RFont()
+    glyph = example_glyph(font)
+    stems = synthetic_glyph(font, 'stems')
+    names = synthetic_names() + [point.name for contour in glyph.contours
+                                 for point in contour.points if point.name]
+    dicts = [at.name2dict(name) for name in names]
+    contour = glyph.contours[0]
+    on_curves = [point.index for point in contour.points if point.type != 'offcurve']
+    # Curves that reach 10 units beyond their end point.
+    curves = [curve for curve in _curves(contour) if curve[-1].y != curve[-2].y]
+    targets = [curve[-1].y + (10 if curve[-1].y > curve[-2].y else -10) for curve in curves]
+    reached = ~np.isnan(et.extend_curves(curves, targets, 'y', False)[:, 0, 0])
+    curves = [curve for curve, is_reached in zip(curves, reached) if is_reached]
+    targets = [target for target, is_reached in zip(targets, reached) if is_reached]
+    lines = np.array([[[x, -100], [x + 50, 1100]] for x in range(0, 1000, 20)], dtype=float)
+    segments = [segment.nodes.T for segment in bt.get_segments(stems.contours[0])] * 10
+    positions = np.random.default_rng(0).uniform(0, 1000, (500, 2))
+    proof_glyphs = [plot.proof_glyph(proof) for proof in (glyph, stems)] * 72
+    with open(_EXAMPLE, 'rb') as glif_file:
+        glif_data = glif_file.read()
+
+    def fresh_glyph():
+        return glyph.copy()
+
+    def append_point_rate(copy):
+        points = copy.contours[0].points
+        apt.append_point_rate(copy.contours[0], [points[i] for i in range(3, 7)], 0.5)
+
+    def append_points(copy):
+        contour = copy.contours[0]
+        points = contour.points
+        apt.append_points(contour, [([points[(segment.end + i) % len(points)] for i in range(-3, 1)], t)
+                                    for segment in bt.get_segments(contour) if segment.degree == 3
+                                    for t in (0.3, 0.6)])
+
+    def fit_contour(copy):
+        # fitter._find_remove_list is not implemented yet, so the stages of
+        # fit_contour before removing points are timed.
+        original, piece = copy.contours[0], copy.contours[1]
+        penpair_lines = fitter._get_penpair_lines(piece)
+        fitter._append_points(original, fitter._get_intersect_points(original, penpair_lines))
+
+    return {
+        'name2dict': (None, lambda _: [at.name2dict(name) for name in names]),
+        'dict2name': (None, lambda _: [at.dict2name(attributes) for attributes in dicts]),
+        'get_penpair_dict': (glyphcache.clear, lambda _: at.get_penpair_dict(glyph)),
+        'get_penpair_dict_cached': (None, lambda _: at.get_penpair_dict(glyph)),
+        'calculate_derivative': (None, lambda _: [dt.calculate_derivative(contour.points, i)
+                                                  for i in on_curves]),
+        'extend_curve': (None, lambda _: [et.extend_curve(curve, target, 'y', False)
+                                          for curve, target in zip(curves, targets)]),
+        'extend_curves': (None, lambda _: et.extend_curves(curves, targets, 'y', False)),
+        'append_point_rate': (fresh_glyph, append_point_rate),
+        'append_points': (fresh_glyph, append_points),
+        'overlap._is_overlap_other_contour': (None, lambda _: [
+                overlap._is_overlap_other_contour(stems.contours, target)
+                for target in stems.contours]),
+        'overlap.find_crossings': (glyphcache.clear, lambda _: overlap.find_crossings(stems)),
+        'fit_contour': (lambda: fitting_glyph(font), fit_contour),
+        'intersect_lines': (None, lambda _: it.intersect_lines(lines, segments)),
+        'windingtools.inside_contours': (glyphcache.clear,
+                                         lambda _: wt.inside_contours(stems, positions)),
+        'glif.read': (None, lambda _: glif.read(glif_data)),
+        'glif.encode': (None, lambda _: glif.read(glif_data).encode({0: {'x': '1', 'y': '2'}})),
+        'plot.render_sheet': (None, lambda _: plot.render_sheet(proof_glyphs, os.devnull)),
+    }
+
+def measure(setup, function, number, repeat):
+    """ Returns the best mean time(seconds) of a call among repeats. """
+    best = float('inf')
+    for _ in range(repeat):
+        elapsed = 0.
+        for _ in range(number):
+            state = setup() if setup is not None else None
+            start = time.perf_counter()
+            function(state)
+            elapsed += time.perf_counter() - start
+        best = min(best, elapsed / number)
+    return best
+
+def run(names=None, number=20, repeat=5):
+    """ Runs benchmarks and returns the results as a dict.
+
+    A benchmark that raises is recorded with its error instead of a time.
+    """
+    benchmarks = _benchmarks()
+    unknown = set(names or ()) - set(benchmarks)
+    if unknown:
+        raise KeyError(f'Unknown benchmarks: {sorted(unknown)}')
+    results = {}
+    for name, (setup, function) in benchmarks.items():
+        if names and name not in names:
+            continue
+        try:
+            results[name] = {'seconds': measure(setup, function, number, repeat),
+                             'number': number, 'repeat': repeat}
+        except Exception as error:
+            results[name] = {'error': ''.join(traceback.format_exception_only(type(error), error))
+                                      .strip()}
+    return {'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'results': results}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks fwig primitives.')
+    parser.add_argument('names', nargs='*', help='benchmarks to run(all by default)')
+    parser.add_argument('-o', '--output', help='JSON file to write results to')
+    parser.add_argument('-n', '--number', type=int, default=20, help='calls per repeat')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='repeats')
+    args = parser.parse_args(argv)
+
+    report = run(args.names, args.number, args.repeat)
+    for name, result in report['results'].items():
+        if 'error' in result:
+            print(f'{name:40s} error: {result["error"].splitlines()[-1]}')
+        else:
+            print(f'{name:40s} {result["seconds"]*1e3:10.3f} ms')
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
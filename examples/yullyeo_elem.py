@@ -1,35 +1,23 @@
 """ This is example of adding elem attribute using by Yullyeo font data.
 
-Last modified date: 2019/12/11
+Last modified date: 2026/10/18
 
 Created by Seongju Woo.
 """
-from fwig.tools import attributetools as at, iterfont
+from fwig.tools import attributetools as at, windingtools as wt, iterfont
 from fontParts.world import CurrentFont
 
-def _is_inside_point(glyph, point):
-    for contour in glyph.contours:
-        if contour.pointInside(point.position):
-            if contour == point.contour:
-                continue
-            return True
-    return False
-
 def add_elem_attr(glyph):
     """ Adds elem attribute to RGlyph object. """
     for contour in glyph.contours:
-        is_stem = True
-        for point in contour.points:
-            if point.type == 'offcurve':
-                continue
-            if _is_inside_point(glyph, point):
-                is_stem = False
-                break
+        positions = [point.position for point in contour.points if point.type != 'offcurve']
+        is_stem = not wt.inside_contours(glyph, positions, exclude_contour=contour.index).any()
         if is_stem:
             at.add_attr(contour.points[0], 'elem', 'stem')
         else:
             at.add_attr(contour.points[0], 'elem', 'branch')
 
+@iterfont.name_only
 def need_elem(glyph):
     """ Finds RGlyph object that needs elem attribute. """
     return not glyph.name.startswith('uni') and glyph.name.endswith('V')
@@ -1,21 +1,17 @@
-from fwig.tools import attributetools as at, iterfont
+from fwig.tools import attributetools as at, windingtools as wt, iterfont
 from fontParts.world import CurrentFont
 
 def _is_inside_point(point, glyph, self_check=False, position=None):
     if position is None:
         position = point.position
-    for contour in glyph.contours:
-        if not self_check and contour == point.contour:
-            continue
-        if contour.pointInside(position):
-            return True
-    return False
+    exclude_contour = None if self_check else point.contour.index
+    return bool(wt.inside_contours(glyph, [position], exclude_contour).any())
 
 def rect_check(point, glyph):
     """ Flip N shape check """
     pos = point.position
     positions = [(pos[0] + 2.5 * ((-1)**(i < 2)), pos[1] + 2.5 * ((-1)**i)) for i in range(4)]
-    return sum(map(lambda x: _is_inside_point(point, glyph, True, x), positions))
+    return int(wt.inside_contours(glyph, positions).any(axis=1).sum())
 
 @iterfont.iter_with_func
 def get_round_points(glyph, *functions, **conditions):
@@ -1,6 +1,7 @@
-from fwig.tools import attributetools as at, iterfont
+from fwig.tools import attributetools as at, iterfont, overlap
 from fontParts.world import CurrentFont
 
+@iterfont.name_only
 def is_serif_contour(glyph):
     return glyph.name.find('V') != -1
 
@@ -18,20 +19,21 @@ def get_serif_point(contour):
     max_y = max(points, key=lambda a: a.y).y
     return [point for point in points if point.x == min_x and point.y == max_y][0]
 
-def is_overlap_vertical_or_not_overlap(overlaps, contour):
-    if overlaps is None:
+def is_overlap_vertical_or_not_overlap(crossings, contour):
+    if not crossings:
         return True
-    overlap_points = list(filter(contour.pointInside, overlaps))
-    if overlap_points:
-        return overlap_points[0][0] == overlap_points[1][0]
+    overlap_points = [crossing.position for crossing in crossings
+                      if contour.index in (crossing.contour_1, crossing.contour_2)]
+    if len(overlap_points) > 1:
+        return abs(overlap_points[0][0] - overlap_points[1][0]) < 1e-6
     else:
         return True
 
 def get_serif_contour(glyph):
-    overlaps = glyph.hasOverlap()
+    crossings = overlap.find_crossings(glyph)
     serif_contours = []
     for contour in glyph.contours:
-        if is_vertical(contour) and is_overlap_vertical_or_not_overlap(overlaps, contour):
+        if is_vertical(contour) and is_overlap_vertical_or_not_overlap(crossings, contour):
             serif_contours.append(contour)
     return serif_contours
 
@@ -1,9 +1,36 @@
+""" This is example of adding stroke attribute using by Yullyeo font data.
+
+Glyphs that already have stroke attribute are found by the attribute index
+saved in the UFO, so they are skipped without being loaded.
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
 from fwig.attributing.stroke import add_stroke_attr
 from fwig.tools import iterfont
+from fwig.tools.attributeindex import AttributeIndex
 from fontParts.world import CurrentFont
 
-def need_stroke(glyph):
-    return not glyph.name.startswith('uni')
+def load_index(font):
+    """ Loads the attribute index of the font, or builds it if it is not saved. """
+    try:
+        return AttributeIndex.load(font)
+    except FileNotFoundError:
+        return AttributeIndex(font)
+
+def need_stroke(index):
+    """ Returns the condition of RGlyph objects that need stroke attribute. """
+    missing = index.glyphs_without('stroke')
+
+    @iterfont.name_only
+    def condition(glyph):
+        return not glyph.name.startswith('uni') and glyph.name in missing
+    return condition
 
 if __name__ == '__main__':
-    iterfont.glyph_generator(CurrentFont(), add_stroke_attr, add_stroke_attr=need_stroke)
+    font = CurrentFont()
+    with load_index(font) as index:
+        iterfont.glyph_generator(font, add_stroke_attr, add_stroke_attr=need_stroke(index))
+        font.save()
+        index.save(font)
@@ -84,8 +84,10 @@ def _calc_center(point):
 
 if __name__ == "__main__":
     def add_tags(glyph):
-        YullyeoTagger(glyph).add_tags()
+        with at.AttributeTransaction(glyph):
+            YullyeoTagger(glyph).add_tags()
 
+    @iterfont.name_only
     def tag_cond(glyph):
         return not glyph.name.startswith("uni")
 
@@ -1,24 +1,12 @@
-import bezier
 import numpy as np
 from fwig.tools import attributetools as at, appendtools as apt, \
-                           extendtools as et, beziertools as bt
+                           extendtools as et, beziertools as bt, intersecttools as it
 
 def _distance(point_1, point_2):
     return (point_1[0] - point_2[0])**2 + (point_1[1] - point_2[1])**2
 
-def _get_all_points(contour):
-    return set([point for point in contour.points if point.type != 'offcurve'])
-
 def _get_penpair_dict(contour):
-    penpair_dict = {}
-    all_points = _get_all_points(contour)
-    for point in all_points:
-        penpair = at.get_attr(point, 'penPair')[1:-1]
-        if penpair in penpair_dict:
-            penpair_dict[penpair].append(point)
-        else:
-            penpair_dict[penpair] = [point]
-    return penpair_dict
+    return at.get_penpair_dict(contour)
 
 def _get_penpair_lines(piece):
     penpair_line_dict = {}
@@ -36,29 +24,36 @@ def _get_penpair_lines(piece):
 
 def _get_intersect_points(original, line_dict):
     intersect_dict = {}
-    for idx, point in enumerate(original.points):
-        if point.type == 'offcurve':
-            continue
-        elif point.type == 'curve':
-            line_segment = bt.RCurve([original.points[idx+i] for i in range(-3, 1)], degree=3)
-        elif point.type == 'line':
-            line_segment = bt.RCurve([original.points[idx+i] for i in range(-1, 1)], degree=1)
-        for line, criteria in line_dict.items():
-            intersect = line_segment.intersect(line)
-            if intersect.any():
-                if line in intersect_dict:
-                    if len(intersect_dict[line]) > 1:
-                        new_intersect = intersect_dict[line][:]
-                        new_intersect.append((original.points[idx-3], point, \
-                                              line_segment.evaluate(intersect[0, 0])))
-                        intersect_dict[line] = sorted(new_intersect, \
-                                                      key=lambda x: _distance(x[2], criteria))[:2]
-                    else:
-                        intersect_dict[line].append((original.points[idx-3], point, \
-                                                     line_segment.evaluate(intersect[0, 0])))
+    contour_segments = bt.get_segments(original)
+    ends = [segment.end for segment in contour_segments]
+    segments = [segment.nodes.T for segment in contour_segments]
+    if not ends or not line_dict:
+        return intersect_dict
+    lines = list(line_dict)
+    s_values = it.first_intersections([line.nodes.T for line in lines], segments)
+    line_numbers, segment_numbers = np.nonzero(~np.isnan(s_values))
+    if not len(line_numbers):
+        return intersect_dict
+    meeting_points = np.full(s_values.shape + (2,), np.nan)
+    meeting_points[line_numbers, segment_numbers] = it.evaluate(
+            [segments[number] for number in segment_numbers], s_values[line_numbers, segment_numbers])
+    for segment_number, idx in enumerate(ends):
+        point = original.points[idx]
+        for line_number, line in enumerate(lines):
+            if np.isnan(s_values[line_number, segment_number]):
+                continue
+            criteria = line_dict[line]
+            meeting_point = meeting_points[line_number, segment_number].reshape(2, 1)
+            if line in intersect_dict:
+                if len(intersect_dict[line]) > 1:
+                    new_intersect = intersect_dict[line][:]
+                    new_intersect.append((original.points[idx-3], point, meeting_point))
+                    intersect_dict[line] = sorted(new_intersect, \
+                                                  key=lambda x: _distance(x[2], criteria))[:2]
                 else:
-                    intersect_dict[line] = [(original.points[idx-3], point, \
-                                             line_segment.evaluate(intersect[0, 0]))]
+                    intersect_dict[line].append((original.points[idx-3], point, meeting_point))
+            else:
+                intersect_dict[line] = [(original.points[idx-3], point, meeting_point)]
     return intersect_dict
 
 def _seg2curve(points, start_idx, end_idx):
@@ -66,18 +61,18 @@ def _seg2curve(points, start_idx, end_idx):
     points_len = len(points)
     if points[end_idx].type == 'offcurve':
         raise ValueError(f'The Point of end index {end_idx} must be curve of line.')
+    segments = {segment.end: segment for segment in bt.get_segments(points[end_idx].contour)}
     if start_idx > end_idx:
         end_idx += points_len
     for idx in range(start_idx+1, end_idx+1):
         if idx >= points_len:
             idx %= points_len
-        if points[idx].type == 'curve':
-            curve_dict[idx] = bt.RCurve([points[idx+i] for i in range(-3, 1)], degree=3)
-        elif points[idx].type == 'line':
-            curve_dict[idx] = bt.RCurve([points[idx+i] for i in range(-1, 1)], degree=1)
+        if idx in segments:
+            curve_dict[idx] = segments[idx].curve
     return curve_dict
 
 def _append_points(original, intersect_points):
+    requests = []
     for intersects in intersect_points.values():
         for start_point, end_point, locate in intersects:
             curve_dict = _seg2curve(original.points, start_point.index, end_point.index)
@@ -90,7 +85,7 @@ def _append_points(original, intersect_points):
                         intersect = curve.intersect(linear_curve)
                         if intersect.any():
                             curve_points = [original.points[idx+i] for i in range(0, -4, -1)]
-                            apt.append_point_coordinate_line(original, curve_points, locate[1][0], True)
+                            requests.append((curve_points[:2], locate[1][0], True))
                             break
                     else:
                         linear_curve = bt.make_linear_curve(
@@ -99,7 +94,7 @@ def _append_points(original, intersect_points):
                         intersect = curve.intersect(linear_curve)
                         if intersect.any():
                             curve_points = [original.points[idx+i] for i in range(0, -4, -1)]
-                            apt.append_point_coordinate_line(original, curve_points, locate[0][0], False)
+                            requests.append((curve_points[:2], locate[0][0], False))
                             break
                 elif curve.degree == 3:
                     if curve.nodes[0][0] == curve.nodes[0][1] == curve.nodes[0][-2] == curve.nodes[0][-1]:
@@ -109,7 +104,7 @@ def _append_points(original, intersect_points):
                         intersect = curve.intersect(linear_curve)
                         if intersect.any():
                             curve_points = [original.points[idx+i] for i in range(0, -4, -1)]
-                            apt.append_point_coordinate(original, curve_points, locate[1][0], True)
+                            requests.append((curve_points, locate[1][0], True))
                             break
                     else:
                         linear_curve = bt.make_linear_curve(
@@ -118,8 +113,9 @@ def _append_points(original, intersect_points):
                         intersect = curve.intersect(linear_curve)
                         if intersect.any():
                             curve_points = list(reversed([original.points[idx-i] for i in range(4)]))
-                            apt.append_point_coordinate(original, curve_points, locate[0][0], False)
+                            requests.append((curve_points, locate[0][0], False))
                             break
+    apt.append_points(original, requests)
 
 def _find_remove_list(original, piece, penpair_lines) -> list:
     1
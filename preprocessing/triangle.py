@@ -1,10 +1,11 @@
 """ Selects points without pairs and makes it into a triangle shape of two points.
 
-Last modified date: 2019/08/28
+Last modified date: 2026/10/18
 
 Created by Seongju Woo.
 """
-from fwig.tools import extendtools as et
+from fontParts.fontshell.contour import RContour
+from fwig.tools import attributetools as at, extendtools as et
 
 class Triangle:
     """ Makes an isolated point into a triangle shape of two points.
@@ -44,13 +45,9 @@ class Triangle:
         self.points = self.contour.points
 
     def _get_max_penpair(self):
-        max_penpair = 0
-        for contour in self.contour.getParent().contours:
-            for point in contour.points:
-                if point.name and 'penPair' in point.name:
-                    max_penpair = max(max_penpair, \
-                                      int(point.name[point.name[:-1].rindex("'") + 2:-2]))
-        return max_penpair
+        penpairs = at.get_penpair_table(self.contour.getParent())['pair']
+        # Points without penPair are -1.
+        return int(penpairs.max(initial=0))
 
     def _classify_right_and_left(self, pair):
         classify_dict = dict()
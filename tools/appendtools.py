@@ -1,11 +1,19 @@
 """ Font tools for appending point at line or curve object.
 
-Last modified date: 2020/01/02
+Many points can be appended to a contour at once by append_points(). Each
+segment is split at all of its parameters at once, and the contour is
+changed and rounded once. Segments can be given by their index, and a
+SegmentLookup keeps the indexes valid across appending.
+
+Last modified date: 2026/10/18
 
 Created by Jeongjae Suk.
 Modified by Seongju Woo.
 """
-from fontTools.misc.bezierTools import splitCubic, splitCubicAtT, splitLine
+import bisect
+import numbers
+import numpy as np
+from fontTools.misc.bezierTools import calcCubicParameters, solveCubic, splitCubicAtT
 
 def append_point_coordinate(contour, rpoints, where, is_horizontal):
     """ Appends RPoint object to curve(RSegment object) by horizontal or vertical line.
@@ -27,14 +35,11 @@ def append_point_coordinate(contour, rpoints, where, is_horizontal):
         arguments value error:: ValueError
             If not found target segment in contour, raises this error.
             This can be occured when the rpoints(RPoint objects) are not in the contour.points.
-        splitting error:: AssertionError
+        splitting error:: ValueError
             If function of splitting is not done properly, raises this error.
             For example, if it split one line(or curve) but result is also one line(or curve).
     """
-    points = _r2t(rpoints)
-    new_curve = splitCubic(points[0], points[1], points[2], points[3], where, is_horizontal)
-    assert(len(new_curve) > 1)
-    _append_point_curve(contour, rpoints, new_curve)
+    append_points(contour, [(rpoints[:4], where, is_horizontal)])
 
 def append_point_rate(contour, rpoints, rate):
     """ Appends RPoint object to curve(RSegment object) by rate.
@@ -53,23 +58,11 @@ def append_point_rate(contour, rpoints, rate):
         arguments value error:: ValueError
             If not found target segment in contour, raises this error.
             This can be occured when the rpoints(RPoint objects) are not in the contour.points.
-        splitting error:: AssertionError
+        splitting error:: ValueError
             If function of splitting is not done properly, raises this error.
             For example, if it split one line(or curve) but result is also one line(or curve).
     """
-    points = _r2t(rpoints)
-    new_curve = splitCubicAtT(points[0], points[1], points[2], points[3], rate)
-    assert(len(new_curve) > 1)
-    _append_point_curve(contour, rpoints, new_curve)
-
-def _append_point_curve(contour, rpoints, curve):
-    segment_index = _segment_index_of(contour, rpoints[3])
-    if segment_index is None:
-        raise ValueError('Not found target segment in contour.')
-    _change_point(contour[segment_index].offCurve[0], curve[1][1])
-    _change_point(contour[segment_index].offCurve[1], curve[1][2])
-    contour.insertSegment(segment_index, 'curve', list(curve[0][1:]))
-    contour.round()
+    append_points(contour, [(rpoints[:4], rate)])
 
 def append_point_coordinate_line(contour, rpoints, where, is_horizontal):
     """ Appends RPoint object to line(RSegment object) by horizontal or vertical line.
@@ -90,18 +83,11 @@ def append_point_coordinate_line(contour, rpoints, where, is_horizontal):
         arguments value error:: ValueError
             If not found target segment in contour, raises this error.
             This can be occured when the rpoints(RPoint objects) are not in the contour.points.
-        splitting error:: AssertionError
+        splitting error:: ValueError
             If function of splitting is not done properly, raises this error.
             For example, if it split one line(or curve) but result is also one line(or curve).
     """
-    points = _r2t(rpoints)
-    new_line = splitLine(points[0], points[1], where, is_horizontal)
-    assert(len(new_line) > 1)
-    segment_index = _segment_index_of(contour, rpoints[1])
-    if segment_index is None:
-        raise ValueError('Not found target segment in contour.')
-    contour.insertSegment(segment_index, 'line', [new_line[0][1]])
-    contour.round()
+    append_points(contour, [(rpoints[:2], where, is_horizontal)])
 
 def append_point_rate_line(contour, rpoints, rate):
     """ Appends RPoint object to line(RSegment object) by rate.
@@ -118,7 +104,7 @@ def append_point_rate_line(contour, rpoints, rate):
     Raises:
         arguments value error:: ValueError
             If contour or rpoints is None or rate is not in [0, 1], raises this error.
-        splitting error:: AssertionError
+        splitting error:: ValueError
             If function of splitting is not done properly, raises this error.
             For example, if it split one line(or curve) but result is also one line(or curve).
     """
@@ -151,11 +137,270 @@ def _internal_division(a, b, rate):
     s = 1 - rate
     return list(map(lambda x: int(round(x)), [b.x*rate + a.x*s, b.y*rate + a.y*s]))
 
-def _segment_index_of(contour, rpoint):
-    for index, segment in enumerate(contour):
-        if segment.onCurve.x == rpoint.x and segment.onCurve.y == rpoint.y:
+class SegmentLookup:
+    """ Segments of RContour object by index.
+
+    Segment indexes follow contour.segments. append_points() shifts the
+    lookup by the points it appends, so it stays valid across appending
+    without reading the contour again. Read it again by update() if the
+    contour is changed in any other way.
+
+    Args:
+        contour:: RContour
+            The RContour object.
+
+    Attributes:
+        ends:: [int, int, ...]
+            Index(at contour.points) of end point of each segment.
+
+    Examples:
+        from fontParts.world import CurrentGlyph
+        from fwig.tools import appendtools as apt
+
+        contour = CurrentGlyph().contours[0]
+        lookup = apt.SegmentLookup(contour)
+        apt.append_points(contour, [(0, 0.5), (2, 0.5)], lookup)
+        # Segment 2 before appending is segment 3 now.
+        apt.append_points(contour, [(lookup.segment_index(9), 0.25)], lookup)
+    """
+    def __init__(self, contour):
+        self.contour = contour
+        self.update()
+
+    def update(self):
+        """ Reads the segments of the contour again. """
+        contour = self.contour
+        self._points = list(contour.naked())
+        self._positions = [(point.x, point.y) for point in self._points]
+        self._types = [point.segmentType or 'offcurve' for point in self._points]
+        # Positions of points appended later are read after contour.round(),
+        # which changes positions that are not rounded yet.
+        self._is_rounded = all(float(x).is_integer() and float(y).is_integer()
+                               for x, y in self._positions)
+
+        ends = [index for index, point_type in enumerate(self._types) if point_type != 'offcurve']
+        if not contour.open:
+            ends = ends[1:] + ends[:1]
+        self._set_ends(ends)
+
+    def _set_ends(self, ends):
+        self.ends = ends
+        self._point_indexes = None
+        self._position_ends = {}
+        for end in ends:
+            self._position_ends.setdefault(self._positions[end], end)
+        # Segment number of each point. A segment owns the points after the
+        # end of the previous segment up to its end.
+        if ends:
+            point_count = len(self._types)
+            ends_array = np.array(ends)
+            counts = (ends_array - np.roll(ends_array, 1) - 1) % point_count + 1
+            self._point_segments = np.roll(np.repeat(np.arange(len(ends)), counts),
+                                           ends[-1] + 1)
+        else:
+            self._point_segments = None
+
+    def _shift(self, inserts, moved_indexes):
+        """ Shifts the lookup by points that _split_segments() inserted.
+
+        inserts is [(index, end index of segment, [(position, type), ...]), ...]
+        sorted by index, and moved_indexes are indexes of points that moved.
+        """
+        if not self._is_rounded:
+            self.update()
+            return
+        insert_indexes, offsets = [], [0]
+        for index, _, new_points in inserts:
+            insert_indexes.append(index)
+            offsets.append(offsets[-1] + len(new_points))
+
+        def shift(index):
+            return index + offsets[bisect.bisect_right(insert_indexes, index)]
+
+        for index, _, new_points in reversed(inserts):
+            self._points[index:index] = [None]*len(new_points)
+            self._positions[index:index] = [position for position, _ in new_points]
+            self._types[index:index] = [point_type for _, point_type in new_points]
+        naked = self.contour.naked()
+        changed_indexes = [shift(index) for index in moved_indexes]
+        new_ends = {}
+        for number, (index, end_index, new_points) in enumerate(inserts):
+            first_index = index + offsets[number]
+            changed_indexes += range(first_index, first_index + len(new_points))
+            new_ends[end_index] = [first_index + i for i, (_, point_type)
+                                   in enumerate(new_points) if point_type != 'offcurve']
+        for index in changed_indexes:
+            point = naked[index]
+            self._points[index] = point
+            self._positions[index] = (point.x, point.y)
+
+        ends = []
+        for end in self.ends:
+            ends += new_ends.get(end, ())
+            ends.append(shift(end))
+        self._set_ends(ends)
+
+    def segment_index(self, point_index):
+        """ Index of the segment that the point(index at contour.points) belongs to.
+
+        Off-curve points belong to the segment of the next on-curve point.
+        """
+        if self._point_segments is None:
+            raise ValueError('The contour has no on-curve point.')
+        return int(self._point_segments[point_index % len(self._point_segments)])
+
+    def segment_points(self, segment_index):
+        """ [(x, y), ...] of points from the start point to the end point of the segment. """
+        end = self.ends[segment_index]
+        degree = _DEGREES.get(self._types[end])
+        if degree is None:
+            raise ValueError(f'Segment {segment_index} is not a line or a curve.')
+        return [self._positions[(end + i) % len(self._positions)] for i in range(-degree, 1)]
+
+    def find(self, rpoints):
+        """ Index(at contour.points) of end point of the segment of rpoints.
+
+        The last RPoint object is looked up by itself first, so points on the
+        same position are not confused. Points that are not in the contour
+        are looked up by their position, the first segment first.
+
+        Returns:
+            end index:: int or None
+        """
+        rpoint = rpoints[-1]
+        naked = rpoint.naked() if hasattr(rpoint, 'naked') else None
+        if self._point_indexes is None:
+            self._point_indexes = {id(point): index for index, point in enumerate(self._points)}
+        index = self._point_indexes.get(id(naked))
+        if index is not None and self._types[index] != 'offcurve':
             return index
-    return None
+        return self._position_ends.get((rpoint.x, rpoint.y))
+
+_DEGREES = {'line': 1, 'curve': 3}
+
+def append_points(contour, requests, lookup=None):
+    """ Appends many RPoint objects to segments(lines or curves) of a contour at once.
+
+    Every requested segment is split at all of its parameters at once. The
+    points are inserted while change notifications of the glyph are held,
+    and the contour is rounded once. Rates and coordinates are of the
+    segments before appending, so requests do not change each other.
+
+    Args:
+        contour:: RContour
+            The RContour object that you want to add RPoint objects.
+        requests:: [(segment, rate) or (segment, where, is_horizontal), ...]
+            segment is an index of segment(at contour.segments), or a list
+            of 4 RPoint objects of curve like append_point_rate() or 2
+            RPoint objects of line like append_point_rate_line(). A request
+            with rate appends the point at the rate, and a request with
+            where and is_horizontal appends points where the segment meets
+            the line like append_point_coordinate().
+        lookup:: SegmentLookup (default is None)
+            The lookup of the contour. It is made if it is None.
+
+    Examples:
+        from fontParts.world import CurrentGlyph
+        from fwig.tools import appendtools as apt
+
+        contour = CurrentGlyph().contours[0]
+        points = contour.points
+        lookup = apt.append_points(contour, [
+            ([points[i] for i in range(0, 4)], 0.5),
+            (3, 120, True),
+            ])
+
+    Returns:
+        lookup:: SegmentLookup
+            The lookup of the contour after appending.
+
+    Raises:
+        arguments value error:: ValueError
+            If not found target segment in contour, raises this error.
+        splitting error:: ValueError
+            If a request does not split its segment, raises this error.
+    """
+    if lookup is None:
+        lookup = SegmentLookup(contour)
+    splits = {}
+    for segment, *where in requests:
+        if isinstance(segment, numbers.Integral):
+            segment = int(segment)
+            points = lookup.segment_points(segment)
+            end_index = lookup.ends[segment]
+        else:
+            end_index = lookup.find(segment)
+            if end_index is None:
+                raise ValueError('Not found target segment in contour.')
+            points = _r2t(segment)
+        t_values = _split_values(points, where)
+        if not t_values:
+            raise ValueError('The request does not split its segment.')
+        splits.setdefault(end_index, (points, set()))[1].update(t_values)
+    if splits:
+        lookup._shift(*_split_segments(contour, splits))
+    return lookup
+
+def _split_values(points, where):
+    """ Parameters of the segment to split at, like splitCubic() and splitLine(). """
+    if len(where) == 1:
+        return [where[0]]
+    where, is_horizontal = where
+    axis = 1 if is_horizontal else 0
+    if len(points) == 4:
+        a, b, c, d = calcCubicParameters(*points)
+        return [t for t in solveCubic(a[axis], b[axis], c[axis], d[axis] - where) if 0 <= t < 1]
+    delta = points[1][axis] - points[0][axis]
+    if delta == 0:
+        return []
+    t = (where - points[0][axis]) / delta
+    return [t] if 0 <= t < 1 else []
+
+def _split_segments(contour, splits):
+    """ Splits segments. splits is {end index: (points of segment, parameters)}.
+
+    Returns inserts, [(index, end index, [(position, type), ...]), ...] sorted
+    by index, and indexes of moved points for SegmentLookup._shift().
+    """
+    points = contour.points
+    point_count = len(points)
+    inserts, moves, moved_indexes = [], [], []
+    for end_index, (segment, t_values) in splits.items():
+        t_values = sorted(t_values)
+        if len(segment) == 4:
+            pieces = splitCubicAtT(*segment, *t_values)
+            first_index = (end_index - 2) % point_count
+            # Points before the first point go to the end like
+            # contour.insertSegment().
+            inserts.append((first_index or point_count, end_index,
+                            [(position, 'curve' if i == 2 else 'offcurve')
+                             for piece in pieces[:-1] for i, position in enumerate(piece[1:])]))
+            moved_indexes += [first_index, (end_index - 1) % point_count]
+            moves += [(points[index], position)
+                      for index, position in zip(moved_indexes[-2:], pieces[-1][1:3])]
+        else:
+            (x_1, y_1), (x_2, y_2) = segment
+            inserts.append((end_index or point_count, end_index,
+                            [((x_1 + (x_2-x_1)*t, y_1 + (y_2-y_1)*t), 'line') for t in t_values]))
+    inserts.sort(key=lambda insert: insert[0])
+
+    glyph = contour.glyph
+    naked = glyph.naked() if glyph is not None else None
+    is_held = getattr(naked, 'holdNotifications', None) is not None
+    if is_held:
+        naked.holdNotifications()
+    try:
+        for rpoint, point in moves:
+            _change_point(rpoint, point)
+        # From the back, so indexes of the rest do not change.
+        for index, _, new_points in reversed(inserts):
+            for position, point_type in reversed(new_points):
+                contour.insertPoint(index, position, type=point_type)
+        contour.round()
+    finally:
+        if is_held:
+            naked.releaseHeldNotifications()
+    return inserts, moved_indexes
 
 def _change_point(rpoint, point):
     rpoint.x = point[0]
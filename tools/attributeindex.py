@@ -0,0 +1,318 @@
+""" Font-wide inverted index of point attributes.
+
+Maps attribute keys and values to point locations, so that finding every point
+with a given penPair, dependX, stroke or serif value does not need to scan
+every point of the font. A location is (glyph name, contour index, point index).
+
+The sidecar file keeps the mtime and size of each .glif file, so glyphs whose
+files were changed after saving are indexed again when the index is loaded.
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
+import os
+import json
+import plistlib
+from fwig.tools import attributetools as at, glif
+
+SIDECAR_NAME = 'com.fwig.attributeindex.json'
+_SIDECAR_VERSION = 2
+
+def _sidecar_path(font_path):
+    return os.path.join(font_path, 'data', SIDECAR_NAME)
+
+def _glyph_files(font_path):
+    """ Returns {glyph name: .glif file path} from contents.plist. """
+    glyphs_path = os.path.join(font_path, 'glyphs')
+    with open(os.path.join(glyphs_path, 'contents.plist'), 'rb') as file_:
+        contents = plistlib.load(file_)
+    return {name: os.path.join(glyphs_path, file) for name, file in contents.items()}
+
+def _file_stat(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class AttributeIndex:
+    """ An inverted index of point attributes in RFont object.
+
+    The index is built in one pass over the font. While track_changes is True,
+    changes made through attributetools are applied to the index incrementally.
+    Call update_glyph() after inserting or removing points of a glyph, because
+    point indexes of that glyph are shifted.
+
+    Args:
+        font:: RFont (default is None)
+            The RFont object that you want to index.
+        track_changes:: bool (default is True)
+            If this is True, follows attribute changes made through attributetools.
+
+    Examples:
+        >>> from fontParts.world import CurrentFont
+        >>> from fwig.tools.attributeindex import AttributeIndex
+        >>> index = AttributeIndex(CurrentFont())
+        >>> index.find('penPair', 'z1r')
+        [('uniAC00', 0, 0), ('uniAC01', 0, 0), ...]
+        >>> index.glyphs_without('stroke')
+        {'uniAC00', ...}
+        >>> index.save(CurrentFont())
+        >>> index.close()
+    """
+    def __init__(self, font=None, track_changes=True):
+        self._font = None
+        self._index = {}
+        self._points = {}
+        self._glyphs = {}
+        self._locations = {}
+        self._tracking = False
+        if font is not None:
+            self.build(font)
+        if track_changes:
+            self._tracking = True
+            at.add_observer(self._attribute_changed)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._points)
+
+    def close(self):
+        """ Stops following attribute changes. """
+        if self._tracking:
+            at.remove_observer(self._attribute_changed)
+            self._tracking = False
+
+    def clear(self):
+        """ Removes every entry of the index. """
+        self._index.clear()
+        self._points.clear()
+        self._glyphs.clear()
+        self._locations.clear()
+
+    def build(self, font):
+        """ Builds the index from every glyph of RFont object.
+
+        Args:
+            font:: RFont
+                The RFont object that you want to index.
+        """
+        self.clear()
+        self._font = font.naked()
+        for key in font.keys():
+            self.update_glyph(font.getGlyph(key))
+
+    def update_glyph(self, glyph):
+        """ Re-indexes every point of RGlyph object.
+
+        Args:
+            glyph:: RGlyph
+                The RGlyph object that you want to re-index.
+        """
+        self.remove_glyph(glyph.name)
+        self._glyphs[glyph.name] = {}
+        for contour_index, contour in enumerate(glyph.contours):
+            for point_index, point in enumerate(contour.points):
+                attributes = at.get_attrs(point)
+                if attributes:
+                    self._add((glyph.name, contour_index, point_index), attributes)
+
+    def _update_glif(self, glyph_name, file_path):
+        """ Re-indexes every point of a glyph from its .glif file. """
+        self.remove_glyph(glyph_name)
+        self._glyphs[glyph_name] = {}
+        glyph = glif.read_file(file_path)
+        point_number = 0
+        for contour_index, length in enumerate(glyph.contour_lengths.tolist()):
+            for point_index in range(length):
+                name = glyph.names[point_number]
+                if name:
+                    self._add((glyph_name, contour_index, point_index), at.name2dict(name))
+                point_number += 1
+
+    def remove_glyph(self, glyph_name):
+        """ Removes every entry of the glyph from the index.
+
+        Args:
+            glyph_name:: str
+                The name of glyph that you want to remove.
+        """
+        for location in list(self._locations.get(glyph_name, ())):
+            self._remove(location)
+        self._locations.pop(glyph_name, None)
+        self._glyphs.pop(glyph_name, None)
+
+    def _add(self, location, attributes):
+        attributes = {key: str(value) for key, value in attributes.items()}
+        self._points[location] = attributes
+        counts = self._glyphs.setdefault(location[0], {})
+        self._locations.setdefault(location[0], set()).add(location)
+        for key, value in attributes.items():
+            self._index.setdefault(key, {}).setdefault(value, set()).add(location)
+            counts[key] = counts.get(key, 0) + 1
+
+    def _remove(self, location):
+        attributes = self._points.pop(location, None)
+        if attributes is None:
+            return
+        counts = self._glyphs[location[0]]
+        self._locations[location[0]].discard(location)
+        for key, value in attributes.items():
+            values = self._index[key]
+            values[value].discard(location)
+            if not values[value]:
+                del values[value]
+                if not values:
+                    del self._index[key]
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
+
+    def _attribute_changed(self, point, old_attributes, new_attributes):
+        glyph = point.glyph
+        if glyph is None or glyph.name not in self._glyphs:
+            return
+        if self._font is not None and glyph.font is not None \
+                and glyph.font.naked() is not self._font:
+            return
+        location = (glyph.name, point.contour.index, point.index)
+        self._remove(location)
+        if new_attributes:
+            self._add(location, new_attributes)
+
+    def get(self, location) -> dict:
+        """ Returns the attributes of the point at location.
+
+        Args:
+            location:: (str, int, int)
+                (glyph name, contour index, point index)
+
+        Returns:
+            attributes:: dict
+                The attribute dictionary. Empty if the point has no attribute.
+        """
+        return dict(self._points.get(tuple(location), {}))
+
+    def find(self, key, value=None) -> list:
+        """ Finds the locations of points that have the attribute.
+
+        Args:
+            key:: str
+                The key of attribute. For example, 'penPair'.
+            value:: str (default is None)
+                The value of attribute. If this is None, every value matches.
+
+        Returns:
+            locations:: list
+                Sorted list of (glyph name, contour index, point index).
+        """
+        values = self._index.get(key, {})
+        if value is None:
+            return sorted(location for locations in values.values() \
+                                   for location in locations)
+        return sorted(values.get(str(value), ()))
+
+    def values(self, key) -> set:
+        """ Returns every value of the attribute in the index.
+
+        Args:
+            key:: str
+                The key of attribute.
+        """
+        return set(self._index.get(key, {}))
+
+    def glyphs_with(self, key, value=None) -> set:
+        """ Returns names of glyphs that have the attribute.
+
+        Args:
+            key:: str
+                The key of attribute.
+            value:: str (default is None)
+                The value of attribute. If this is None, every value matches.
+        """
+        if value is None:
+            return {name for name, counts in self._glyphs.items() if key in counts}
+        return {location[0] for location in self._index.get(key, {}).get(str(value), ())}
+
+    def glyphs_without(self, key) -> set:
+        """ Returns names of glyphs that do not have the attribute at all.
+
+        Args:
+            key:: str
+                The key of attribute. For example, 'stroke'.
+        """
+        return {name for name, counts in self._glyphs.items() if key not in counts}
+
+    def save(self, font_or_path):
+        """ Saves the index as a sidecar file in the data directory of UFO.
+
+        The mtime and size of each .glif file are saved with the index, so
+        save the font before saving its index.
+
+        Args:
+            font_or_path:: RFont or str
+                The RFont object or the path of UFO format font data.
+        """
+        font_path = getattr(font_or_path, 'path', font_or_path)
+        glyphs = {name: [] for name in self._glyphs}
+        for (name, contour_index, point_index), attributes in sorted(self._points.items()):
+            glyphs[name].append([contour_index, point_index, attributes])
+        files = _glyph_files(font_path)
+        stats = {name: _file_stat(files[name]) for name in glyphs if name in files}
+        path = _sidecar_path(font_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file_:
+            json.dump({'version': _SIDECAR_VERSION, 'glyphs': glyphs, 'stats': stats}, file_,
+                      ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, font_or_path, track_changes=True):
+        """ Loads the index saved by save().
+
+        Entries of glyphs whose .glif files were changed, added or removed
+        since saving are not trusted. Those glyphs are indexed again, from
+        RFont object if it is given, or else from their .glif files.
+
+        Args:
+            font_or_path:: RFont or str
+                The RFont object or the path of UFO format font data.
+            track_changes:: bool (default is True)
+                If this is True, follows attribute changes made through attributetools.
+
+        Raises:
+            sidecar version error:: ValueError
+                If the sidecar file was written by an unknown version.
+
+        Returns:
+            index:: AttributeIndex
+        """
+        font_path = getattr(font_or_path, 'path', font_or_path)
+        with open(_sidecar_path(font_path), encoding='utf-8') as file_:
+            data = json.load(file_)
+        if data.get('version') != _SIDECAR_VERSION:
+            raise ValueError('Unknown attribute index version: ' + str(data.get('version')))
+        index = cls(track_changes=track_changes)
+        font = None if isinstance(font_or_path, str) else font_or_path
+        if font is not None:
+            index._font = font.naked()
+        stats = data['stats']
+        for name, file_path in _glyph_files(font_path).items():
+            entries = data['glyphs'].get(name)
+            if entries is not None and stats.get(name) == _file_stat(file_path):
+                index._glyphs[name] = {}
+                for contour_index, point_index, attributes in entries:
+                    index._add((name, contour_index, point_index), attributes)
+            elif font is not None:
+                index.update_glyph(font.getGlyph(name))
+            else:
+                index._update_glif(name, file_path)
+        return index
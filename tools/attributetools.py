@@ -1,106 +1,348 @@
 """ This is for handling stemfont attributes.
 
-Last modified date: 2019/09/09
+Last modified date: 2026/10/18
 
 Created by Seongju Woo.
 """
 import os
-import json
-from xml.etree import ElementTree as et
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from fontParts.fontshell.contour import RContour
 from fontParts.fontshell.glyph import RGlyph
+from fwig.tools import glif
+from fwig.tools.glyphcache import GlyphCache, invalidate as _invalidate_glyph
 
-def name2attr(path):
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'size', 'hit_rate'])
+
+def _point_key(point):
+    naked = getattr(point, 'naked', None)
+    if naked is None:
+        return id(point)
+    return id(naked())
+
+
+class _AttributeCache:
+    """ Keeps parsed attribute dictionaries of RPoint objects.
+
+    Entries are keyed by the identity of the wrapped point object, because
+    fontParts creates a new RPoint wrapper every time contour.points is used.
+    Each entry remembers the name it was parsed from, so an entry is
+    invalidated as soon as the point's name changes.
+    """
+    def __init__(self, maxsize=1 << 19):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    def get(self, point) -> dict:
+        """ Returns parsed attributes of the point. Do not modify the result. """
+        name = point.name
+        key = _point_key(point)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == name:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        attributes = name2dict(name)
+        self.put(point, name, attributes, key)
+        return attributes
+
+    def put(self, point, name, attributes, key=None):
+        """ Stores already parsed attributes of the point. """
+        if len(self._entries) >= self.maxsize:
+            self._entries.clear()
+        if key is None:
+            key = _point_key(point)
+        self._entries[key] = (name, attributes)
+
+    def clear(self):
+        """ Removes every entry and resets the counters. """
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """ Returns hits, misses, size and hit rate of the cache. """
+        total = self.hits + self.misses
+        return CacheInfo(self.hits, self.misses, len(self._entries),
+                         self.hits / total if total else 0.0)
+
+
+_cache = _AttributeCache()
+
+def cache_info() -> CacheInfo:
+    """ Returns the statistics of the parsed attribute cache.
+
+    Returns:
+        cache statistics:: CacheInfo
+            A named tuple of (hits, misses, size, hit_rate).
+
+    Examples:
+        >>> from fwig.tools import attributetools as at
+        >>> at.cache_clear()
+        >>> at.get_attr(point, 'penPair')
+        'z1r'
+        >>> at.get_attr(point, 'penPair')
+        'z1r'
+        >>> at.cache_info()
+        CacheInfo(hits=1, misses=1, size=1, hit_rate=0.5)
+    """
+    return _cache.info()
+
+def cache_clear():
+    """ Clears the parsed attribute cache and its statistics. """
+    _cache.clear()
+
+_observers = []
+
+def add_observer(observer):
+    """ Registers a function that is called when attributes are changed.
+
+    The observer is called after every change made through this module as
+    observer(point, old_attributes, new_attributes).
+
+    Args:
+        observer:: function
+            The function that you want to be notified.
+    """
+    if observer not in _observers:
+        _observers.append(observer)
+
+def remove_observer(observer):
+    """ Unregisters a function registered by add_observer().
+
+    Args:
+        observer:: function
+            The function that you do not want to be notified anymore.
+    """
+    try:
+        _observers.remove(observer)
+    except ValueError:
+        pass
+
+_transactions = []
+
+def _read_attributes(point) -> dict:
+    if _transactions:
+        key = _point_key(point)
+        for transaction in reversed(_transactions):
+            staged = transaction._staged.get(key)
+            if staged is not None:
+                return staged[1]
+    return _cache.get(point)
+
+def _apply_attributes(point, attributes):
+    old_attributes = _cache.get(point) if _observers else None
+    name = dict2name(attributes)
+    point.name = name
+    _cache.put(point, name, attributes)
+    for observer in list(_observers):
+        observer(point, old_attributes, attributes)
+
+def _innermost_transaction(glyph, transactions):
+    for transaction in reversed(transactions):
+        if transaction._covers(glyph):
+            return transaction
+    return None
+
+def _write_attributes(point, attributes):
+    glyph = point.glyph
+    # Cached values such as penPair tables are built from the staged
+    # attributes too, so they are dropped on staging as well.
+    _invalidate_glyph(glyph)
+    transaction = _innermost_transaction(glyph, _transactions)
+    if transaction is not None:
+        transaction._stage(point, attributes, glyph)
+        return
+    _apply_attributes(point, attributes)
+    if glyph is not None:
+        glyph.setChanged()
+
+def _glif_files(path):
+    path = os.path.join(path, 'glyphs')
+    return [os.path.join(path, file) for file in sorted(os.listdir(path)) \
+                                     if file.endswith('.glif')]
+
+def _convert_glifs(convert, path, jobs):
+    files = _glif_files(path)
+    if jobs == 1:
+        results = [convert(file) for file in files]
+    else:
+        jobs = jobs or os.cpu_count()
+        chunksize = max(1, len(files) // (4*jobs))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(convert, files, chunksize=chunksize))
+    return [file for file, changed in zip(files, results) if changed]
+
+def _name2attr_file(file_path) -> bool:
+    with open(file_path, 'rb') as file_:
+        data = file_.read()
+    if not any('name' in keys for keys in glif.point_keys(data)):
+        return False
+    glyph = glif.read(data)
+    changes = {}
+    for index, attributes in enumerate(glyph.attributes):
+        name = attributes.get('name')
+        if name is not None:
+            attributes = {key: value for key, value in attributes.items() if key != 'name'}
+            attributes.update(name2dict(name))
+            changes[index] = attributes
+    if changes:
+        glif.write_file(file_path, glyph.encode(changes))
+    return bool(changes)
+
+def _attr2name_file(file_path) -> bool:
+    with open(file_path, 'rb') as file_:
+        data = file_.read()
+    for keys in glif.point_keys(data):
+        if 'name' not in keys and any(key not in glif.BASE_ATTRIBUTES for key in keys):
+            break
+    else:
+        return False
+    glyph = glif.read(data)
+    changes = {}
+    for index, attributes in enumerate(glyph.attributes):
+        if attributes.get('name') is not None:
+            continue
+        extra_attributes = {key: value for key, value in attributes.items() \
+                                       if key not in glif.BASE_ATTRIBUTES}
+        if extra_attributes:
+            attributes = {key: value for key, value in attributes.items() \
+                                     if key in glif.BASE_ATTRIBUTES}
+            attributes['name'] = dict2name(extra_attributes)
+            changes[index] = attributes
+    if changes:
+        glif.write_file(file_path, glyph.encode(changes))
+    return bool(changes)
+
+def name2attr(path, jobs=1) -> list:
     """ Converts JSON format string to xml attributes.
 
+    Only .glif files that contain named points are parsed and rewritten.
+    Only tags of the changed points are written again, and each rewritten
+    file is replaced atomically.
+
     Args:
         path:: str
             A path of the UFO format font data.
+        jobs:: int (default is 1)
+            The number of worker processes. If this value is None, uses
+            every CPU of the machine.
+
+    Returns:
+        changed files:: list
+            Paths of the .glif files that were rewritten.
+
+    Examples:
+        >>> from fwig.tools import attributetools as at
+        >>> changed = at.name2attr('Yullyeo.ufo', jobs=8)
     """
-    path += '/glyphs'
-    files = os.listdir(path)
-    for file in files:
-        tree = et.parse(path + "/" + file)
-        glyph = tree.getroot()
-        outline = glyph.find("outline")
-        if outline is None:
-            continue
-        contours = outline.getchildren()
-        for contour in contours:
-            for point in contour.getchildren():
-                name = (point.get("name"))
-                if name is not None:
-                    name_dict = name2dict(name)
-                    for attr in list(name_dict.items()):
-                        point.attrib[attr[0]] = attr[1]
-                    try:
-                        del point.attrib['name']
-                    except:
-                        pass
-
-        tree.write(path + "/" + file, encoding="UTF-8", xml_declaration=True)
-
-def attr2name(path):
+    return _convert_glifs(_name2attr_file, path, jobs)
+
+def attr2name(path, jobs=1) -> list:
     """ Converts xml attributes to JSON format string.
 
+    Only .glif files that contain points with extra xml attributes are
+    parsed and rewritten. Only tags of the changed points are written
+    again, and each rewritten file is replaced atomically.
+
     Args:
         path:: str
             A path of the UFO format font data.
+        jobs:: int (default is 1)
+            The number of worker processes. If this value is None, uses
+            every CPU of the machine.
+
+    Returns:
+        changed files:: list
+            Paths of the .glif files that were rewritten.
     """
-    path += "/glyphs"
-    files = os.listdir(path)
-    for file in files:
-        if file.find(".glif") == -1:
-            continue
-        tree = et.parse(path + "/" + file)
-        glyph = tree.getroot()
-        outline = glyph.find("outline")
-        if outline is None:
-            continue
-        contours = outline.getchildren()
-        for contour in contours:
-            for point in contour.getchildren():
-                if point.get("name") is not None:
-                    continue
-                data = ""
-                attr = []
-                for a in point.attrib:
-                    if a == 'x' or a == 'y' or a == 'type' or a == 'smooth':
-                        continue
-                    if data:
-                        data += ","
-                    data += "'" + a + "':'" + point.get(a) + "'" 
-                    attr.append(a)
-                for x in attr:
-                    point.attrib.pop(x)
-                if data:
-                    point.set("name",data)
-
-        tree.write(path + "/" + file, encoding="UTF-8", xml_declaration=True)
+    return _convert_glifs(_attr2name_file, path, jobs)
+
+# An item of point names, 'key':'value'. Keys and values are quoted by ' or
+# ", and values may also be numbers, true, false or null like the JSON format.
+_QUOTED = r"""(?:'([^'\\]*(?:\\.[^'\\]*)*)'|"([^"\\]*(?:\\.[^"\\]*)*)")"""
+_NAME_ITEM = re.compile(r'\s*' + _QUOTED + r'\s*:\s*(?:' + _QUOTED
+                        + r'|(-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)'
+                        + r'|(true|false|null))\s*(,?)', re.DOTALL)
+_ESCAPE = re.compile(r'\\(u[0-9a-fA-F]{4}|.)', re.DOTALL)
+_ESCAPED_CHARACTERS = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+_CONSTANTS = {'true': True, 'false': False, 'null': None}
+
+def _unescape_character(match):
+    escaped = match.group(1)
+    if len(escaped) == 5:
+        return chr(int(escaped[1:], 16))
+    return _ESCAPED_CHARACTERS.get(escaped, escaped)
+
+def _number(text):
+    if '.' in text or 'e' in text or 'E' in text:
+        return float(text)
+    return int(text)
 
 def name2dict(name) -> dict:
     """ Converts JSON format string to dictionary.
 
+    Names are read by a single pass over their items. Keys and values are
+    quoted by ' or ", and a backslash escapes the next letter. Values that
+    are numbers, true, false or null are converted like the JSON format.
+
     Args:
         name:: str
             A JSON format string. For example, "'penPair':'z1r'".
 
+    Raises:
+        name format error:: ValueError
+            If the name is not in the format.
+
     Examples:
         >>> from fwig.tools import attributetools as at
         >>> name = "'penPair':'z1r','serif':'1'"
         >>> at.name2dict(name)
         {'penPair': 'z1r', 'serif': '1'}
     """
-    if name is None:
-        return {}
-    name = '{' + name.replace("'", '"') + '}'
-    name_dict = json.loads(name)
-
+    name_dict = {}
+    if name is None or not name.strip():
+        return name_dict
+    match_item, position = _NAME_ITEM.match, 0
+    escaped = '\\' in name
+    while True:
+        match = match_item(name, position)
+        if match is None:
+            raise ValueError(f'Invalid point name {name!r} at {position}.')
+        key, double_key, value, double_value, number, constant, separator = match.groups()
+        if key is None:
+            key = double_key
+        if value is None:
+            value = double_value
+        if value is None:
+            value = _CONSTANTS[constant] if number is None else _number(number)
+        elif escaped:
+            value = _ESCAPE.sub(_unescape_character, value)
+        if escaped:
+            key = _ESCAPE.sub(_unescape_character, key)
+        name_dict[key] = value
+        position = match.end()
+        if not separator:
+            break
+    if position != len(name):
+        raise ValueError(f'Invalid point name {name!r} at {position}.')
     return name_dict
 
+def _quote(value):
+    value = value if isinstance(value, str) else str(value)
+    if '\\' in value or "'" in value:
+        value = value.replace('\\', '\\\\').replace("'", "\\'")
+    return "'" + value + "'"
+
 def dict2name(dict_attributes) -> str:
     """ Converts attribute dictionary to JSON format string.
 
+    Keys and values are written as strings in ' quotes. Backslashes and
+    quotes in them are escaped, so name2dict() reads them back.
+
     Args:
         dict_attributes:: dict
             A dictionary of attributes.
@@ -111,7 +353,12 @@ def dict2name(dict_attributes) -> str:
         >>> at.dict2name(dict_)
         "'penPair':'z1r','serif':'1'"
     """
-    return ','.join([f"'{k}':'{v}'" for k, v in dict_attributes.items()])
+    name = ','.join([f"'{key}':'{value}'" for key, value in dict_attributes.items()])
+    # Every item has four quotes unless a key or a value needs escaping.
+    if '\\' in name or name.count("'") != 4*len(dict_attributes):
+        name = ','.join([_quote(key) + ':' + _quote(value)
+                         for key, value in dict_attributes.items()])
+    return name
 
 def get_attr(point, attribute):
     """ Gets attribute value from RPoint object.
@@ -126,8 +373,21 @@ def get_attr(point, attribute):
         attribute value:: str
             The value of attribute.
     """
-    attributes = name2dict(point.name)
-    return attributes.get(attribute)
+    return _read_attributes(point).get(attribute)
+
+def get_attrs(point) -> dict:
+    """ Gets every attribute of RPoint object.
+
+    Args:
+        point:: RPoint
+            The RPoint object that you want to get attributes.
+
+    Returns:
+        attributes:: dict
+            A copy of the attribute dictionary. Empty if the point has no
+            attribute.
+    """
+    return dict(_read_attributes(point))
 
 def set_attr(point, attribute, value):
     """ Sets attribute to RPoint object.
@@ -140,11 +400,10 @@ def set_attr(point, attribute, value):
         value:: str
             The new value of attribute that you want to set.
     """
-    attributes = name2dict(point.name)
+    attributes = dict(_read_attributes(point))
     if attribute in attributes:
         attributes[attribute] = value
-        point.name = dict2name(attributes)
-        point.glyph.setChanged()
+        _write_attributes(point, attributes)
 
 def add_attr(point, attribute, value):
     """ Adds attribute to RPoint object.
@@ -157,11 +416,10 @@ def add_attr(point, attribute, value):
         value:: str
             The value of attribute that you want to add.
     """
-    attributes = name2dict(point.name)
+    attributes = dict(_read_attributes(point))
     if attribute not in attributes:
         attributes[attribute] = value
-        point.name = dict2name(attributes)
-        point.glyph.setChanged()
+        _write_attributes(point, attributes)
 
 def del_attr(point, attribute):
     """ Deletes attribute from RPoint object.
@@ -172,14 +430,13 @@ def del_attr(point, attribute):
         attribute:: str
             The key of attribute that you want to delete.
     """
-    attributes = name2dict(point.name)
+    attributes = dict(_read_attributes(point))
     try:
         del(attributes[attribute])
-        point.glyph.setChanged()
     except KeyError:
         return None
     else:
-        point.name = dict2name(attributes)
+        _write_attributes(point, attributes)
 
 def get_all_points(obj, offcurve=False):
     """ Gets all RPoint objects of RGlyph or RContour object.
@@ -211,28 +468,164 @@ def get_all_points(obj, offcurve=False):
         else:
             return set([point for point in contour.points])
             
-def get_penpair_dict(glyph):
-    """ Gets penPair attribute dictionary of RGlyph object.
+PENPAIR_DTYPE = np.dtype([('pair', 'i4'), ('side', 'U1'), ('key', 'O'), ('contour', 'i4'),
+                          ('point', 'i4'), ('x', 'f8'), ('y', 'f8')])
+
+def split_penpair(penpair):
+    """ Splits penPair attribute value into its key, pair number and side.
+
+    Args:
+        penpair:: str
+            The penPair attribute value. For example, 'z1r'.
+
+    Examples:
+        >>> from fwig.tools import attributetools as at
+        >>> at.split_penpair('z01r')
+        ('01', 1, 'r')
+        >>> at.split_penpair('zAr')
+        ('A', -1, 'r')
+
+    Returns:
+        key, pair number and side:: (str, int, str)
+            The key is the value without its first and last letters. The
+            pair number is -1 if the key is not a number.
+    """
+    key = penpair[1:-1]
+    try:
+        number = int(key)
+    except ValueError:
+        number = -1
+    return key, number, penpair[-1:]
+
+def _penpair_rows(contours, contour_indexes):
+    rows = []
+    for contour_index, contour in zip(contour_indexes, contours):
+        for point_index, point in enumerate(contour.points):
+            if point.type == 'offcurve':
+                continue
+            penpair = _read_attributes(point).get('penPair')
+            key, number, side = (None, -1, '') if penpair is None else split_penpair(penpair)
+            rows.append((number, side, key, contour_index, point_index, point.x, point.y))
+    return np.array(rows, dtype=PENPAIR_DTYPE)
+
+def _build_penpair_table(glyph):
+    contours = glyph.contours
+    return _penpair_rows(contours, range(len(contours)))
+
+_penpair_tables = GlyphCache(_build_penpair_table)
+
+def get_penpair_table(obj) -> np.ndarray:
+    """ Gets penPair attribute table of RGlyph or RContour object.
+
+    The table of RGlyph object is cached until the glyph changes, so do not
+    modify it. The table of RContour object is a part of its glyph's table.
 
     Args:
-        glyph:: RGlyph
-            The RGlyph object that you want to get penPair attribute dictionary.
+        obj:: RGlyph or RContour
+            The RGlyph or RContour object that you want to get penPair table.
+
+    Returns:
+        penpair_table:: numpy.ndarray (PENPAIR_DTYPE)
+            A structured array with a row for every on-curve point. Its columns
+            are 'pair'(pair number), 'side'('l' or 'r'), 'key'(the penPair
+            value without its first and last letters, like the keys of
+            get_penpair_dict()), 'contour'(contour index), 'point'(index in
+            contour.points), 'x' and 'y'. Points without penPair attribute
+            have None as 'key', and 'pair' is -1 for them and for keys that
+            are not numbers.
+
+    Examples:
+        >>> from fontParts.world import CurrentGlyph
+        >>> from fwig.tools import attributetools as at
+        >>> table = at.get_penpair_table(CurrentGlyph())
+        >>> table[table['pair'] == 1]
+        array([(1, 'l', '1', 0, 0, 420., 550.), (1, 'r', '1', 0, 9, 20., 51.)], ...)
+        >>> table['pair'].max()
+        12
+    """
+    if hasattr(obj, 'contours'):
+        return _penpair_tables.get(obj)
+    glyph = obj.glyph
+    if glyph is None:
+        return _penpair_rows([obj], [0])
+    table = _penpair_tables.get(glyph)
+    return table[table['contour'] == obj.index]
+
+def check_penpair_table(table):
+    """ Checks that every row of a penPair table has a pair number.
+
+    Args:
+        table:: numpy.ndarray (PENPAIR_DTYPE)
+            The table from get_penpair_table().
+
+    Raises:
+        missing or malformed penPair:: ValueError
+            If an on-curve point has no penPair attribute, or its pair is
+            not a number.
+    """
+    for row in table[table['pair'] < 0]:
+        if row['key'] is None:
+            message = 'has no penPair attribute'
+        else:
+            message = f"has penPair attribute of pair {row['key']!r}, which is not a number"
+        raise ValueError(f"Point {row['point']} of contour {row['contour']} {message}.")
+
+def get_penpair_distances(obj):
+    """ Gets the distance between two points of each penPair.
+
+    Args:
+        obj:: RGlyph or RContour
+            The RGlyph or RContour object that you want to get distances.
+
+    Returns:
+        pair keys and distances:: (numpy.ndarray, numpy.ndarray)
+            Keys(like get_penpair_dict()) of pairs that have exactly two
+            points and their distances.
+    """
+    table = get_penpair_table(obj)
+    table = table[np.not_equal(table['key'], None)]
+    table = table[np.lexsort((table['side'], table['key'].astype(str)))]
+    keys, starts, counts = np.unique(table['key'].astype(str), return_index=True,
+                                     return_counts=True)
+    complete = counts == 2
+    first, second = table[starts[complete]], table[starts[complete] + 1]
+    return keys[complete], np.hypot(first['x'] - second['x'], first['y'] - second['y'])
+
+def get_penpair_dict(obj):
+    """ Gets penPair attribute dictionary of RGlyph or RContour object.
+
+    Args:
+        obj:: RGlyph or RContour
+            The RGlyph or RContour object that you want to get penPair attribute
+            dictionary.
+
+    Raises:
+        missing penPair:: ValueError
+            If an on-curve point of the object has no penPair attribute.
 
     Returns:
         penpair_dict:: dict
-            The penPair attribute dictionary of RGlyph object. If there is no
-            penPair attribute in the RGlyph object, returns empty dictionary.
+            The penPair attribute dictionary of the object. The keys are the
+            penPair values without their first and last letters(for example,
+            '1' for 'z1r') and the values are lists of RPoint objects. If there
+            is no on-curve point in the object, returns empty dictionary.
     """
+    table = get_penpair_table(obj)
+    missing = table[np.equal(table['key'], None)]
+    if len(missing):
+        check_penpair_table(missing)
+    contour_indexes = set(table['contour'].tolist())
+    if hasattr(obj, 'contours'):
+        contours = obj.contours
+        points = {index: contours[index].points for index in contour_indexes}
+    else:
+        points = {index: obj.points for index in contour_indexes}
     penpair_dict = {}
-    all_points = get_all_points(glyph)
-    for point in all_points:
-        penpair = get_attr(point, 'penPair')[1:-1]
-        if penpair is None:
-            continue
-        if penpair in penpair_dict:
-            penpair_dict[penpair].append(point)
-        else:
-            penpair_dict[penpair] = [point]
+    for key, contour_index, point_index in zip(table['key'].tolist(),
+                                               table['contour'].tolist(),
+                                               table['point'].tolist()):
+        point = points[contour_index][point_index]
+        penpair_dict.setdefault(key, []).append(point)
     return penpair_dict
 
 
@@ -265,13 +658,10 @@ class Attribute:
     """
     def __init__(self, point):
         self.point = point
-        if point.name:
-            self.attribute = name2dict(point.name)
-        else:
-            self.attribute = {}
+        self.attribute = dict(_read_attributes(point))
 
     def _update_attr(self):
-        self.point.name = dict2name(self.attribute)
+        _write_attributes(self.point, dict(self.attribute))
 
     def get_attr(self, attribute):
         """ Gets attribute value from RPoint object.
@@ -297,7 +687,6 @@ class Attribute:
         """
         if attribute in self.attribute:
             self.attribute[attribute] = value
-            self.point.glyph.setChanged()
             self._update_attr()
 
     def add_attr(self, attribute, value):
@@ -311,7 +700,6 @@ class Attribute:
         """
         if attribute not in self.attribute:
             self.attribute[attribute] = value
-            self.point.glyph.setChanged()
             self._update_attr()
 
     def del_attr(self, attribute):
@@ -323,8 +711,108 @@ class Attribute:
         """
         try:
             del(self.attribute[attribute])
-            self.point.glyph.setChanged()
         except KeyError:
             return None
         else:
             self._update_attr()
+
+
+class AttributeTransaction:
+    """ Collects attribute changes of RGlyph or RFont object and commits them at once.
+
+    While the transaction is active, changes made through this module to points
+    of the target are kept in memory and read back from there. Committing writes
+    each changed point's name once and calls setChanged() once per glyph.
+    Leaving the with block commits the changes, or rolls them back if an
+    exception was raised.
+
+    A transaction inside another transaction that covers the same glyphs
+    commits into the enclosing one, so rolling back the enclosing one also
+    discards the inner changes. Names are written only when the outermost
+    transaction commits. Cached values of glyphs such as penPair tables
+    follow the staged changes, and are dropped again on commit and rollback.
+
+    Args:
+        obj:: RGlyph or RFont
+            The RGlyph or RFont object that you want to change attributes of.
+
+    Examples:
+        >>> from fontParts.world import CurrentGlyph
+        >>> from fwig.tools import attributetools as at
+        >>> glyph = CurrentGlyph()
+        >>> point = glyph.contours[0].points[0]
+        >>> with at.AttributeTransaction(glyph):
+        ...     at.add_attr(point, 'dependX', 'z2r')
+        ...     at.get_attr(point, 'dependX')
+        ...     point.name
+        'z2r'
+        "'penPair':'z1r'"
+        >>> point.name
+        "'penPair':'z1r','dependX':'z2r'"
+    """
+    def __init__(self, obj):
+        self.obj = obj
+        self._target = obj.naked()
+        self._is_glyph = hasattr(obj, 'contours')
+        self._staged = {}
+
+    def __enter__(self):
+        _transactions.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _transactions.remove(self)
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def __len__(self):
+        return len(self._staged)
+
+    def _covers(self, glyph):
+        if glyph is None:
+            return False
+        if self._is_glyph:
+            return glyph.naked() is self._target
+        font = glyph.font
+        return font is not None and font.naked() is self._target
+
+    def _stage(self, point, attributes, glyph):
+        # Keeps the contour alive, because RPoint refers to it weakly.
+        self._staged[_point_key(point)] = (point, attributes, point.contour, glyph)
+
+    def commit(self):
+        """ Writes every staged change and notifies each changed glyph once.
+
+        If an enclosing transaction covers a changed glyph, the change is
+        staged in the enclosing transaction instead.
+        """
+        staged, self._staged = self._staged, {}
+        if self in _transactions:
+            enclosing = _transactions[:_transactions.index(self)]
+        else:
+            enclosing = _transactions
+        changed_glyphs = {}
+        for key, entry in staged.items():
+            point, attributes, _, glyph = entry
+            transaction = _innermost_transaction(glyph, enclosing)
+            if transaction is not None:
+                transaction._staged[key] = entry
+                continue
+            if dict2name(attributes) == (point.name or ''):
+                continue
+            _apply_attributes(point, attributes)
+            if glyph is not None:
+                changed_glyphs[id(glyph.naked())] = glyph
+        for glyph in changed_glyphs.values():
+            _invalidate_glyph(glyph)
+            glyph.setChanged()
+
+    def rollback(self):
+        """ Discards every staged change. """
+        staged, self._staged = self._staged, {}
+        glyphs = {id(glyph.naked()): glyph for _, _, _, glyph in staged.values()
+                  if glyph is not None}
+        for glyph in glyphs.values():
+            _invalidate_glyph(glyph)
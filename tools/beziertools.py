@@ -1,5 +1,6 @@
 import numpy as np
 import bezier
+from fwig.tools.glyphcache import GlyphCache
 
 def point2nodes(points):
     return np.asfortranarray([[float(point.x) for point in points],
@@ -37,3 +38,96 @@ class RCurve(bezier.Curve):
     def __init__(self, points, degree, _copy=True):
         super().__init__(point2nodes(points), degree, _copy)
         self.points = points
+
+
+class Segment:
+    """ A linear or cubic segment of a contour.
+
+    Args:
+        nodes:: 2 x (degree+1) numpy.ndarray (float)
+            Fortran-ordered coordinates of nodes. The rows are x and y.
+        degree:: int
+            1 for line, 3 for curve.
+        start:: int
+            Index(at contour.points) of the start point.
+        end:: int
+            Index(at contour.points) of the end point.
+    """
+    __slots__ = ('nodes', 'degree', 'start', 'end', '_curve')
+
+    def __init__(self, nodes, degree, start, end):
+        self.nodes = nodes
+        self.degree = degree
+        self.start = start
+        self.end = end
+        self._curve = None
+
+    @property
+    def curve(self):
+        """ bezier.Curve object of the segment. It is made once. """
+        if self._curve is None:
+            self._curve = bezier.Curve(self.nodes, degree=self.degree)
+        return self._curve
+
+    def __repr__(self):
+        return f'<Segment degree={self.degree} start={self.start} end={self.end}>'
+
+_DEGREES = {'line': 1, 'curve': 3}
+
+def points2segments(points):
+    """ Splits points of a contour into segments.
+
+    Points that are not the end of line or curve(offcurve, move, qcurve)
+    do not make a segment.
+
+    Args:
+        points:: [RPoint, RPoint, ...]
+            RContour's points(RPoint objects).
+
+    Returns:
+        segments:: (Segment, Segment, ...)
+            Segments ordered by their end points.
+    """
+    coordinates = np.array([(float(point.x), float(point.y)) for point in points]).reshape(-1, 2)
+    segments = []
+    for idx, point in enumerate(points):
+        degree = _DEGREES.get(point.type)
+        if degree is None:
+            continue
+        indexes = [(idx+i) % len(points) for i in range(-degree, 1)]
+        nodes = np.asfortranarray(coordinates[indexes].T)
+        nodes.flags.writeable = False
+        segments.append(Segment(nodes, degree, indexes[0], idx))
+    return tuple(segments)
+
+def _build_segments(glyph, contour_index):
+    return points2segments(glyph.contours[contour_index].points)
+
+_segments = GlyphCache(_build_segments)
+
+def get_segments(contour):
+    """ Gets segments of RContour object.
+
+    The segments are cached until the glyph of the contour changes, so do not
+    change their nodes.
+
+    Args:
+        contour:: RContour
+            The RContour object.
+
+    Examples:
+        from fontParts.world import CurrentGlyph
+        from fwig.tools import beziertools as bt
+
+        contour = CurrentGlyph().contours[0]
+        for segment in bt.get_segments(contour):
+            print(segment.start, segment.end, segment.curve.length)
+
+    Returns:
+        segments:: (Segment, Segment, ...)
+            Segments ordered by their end points.
+    """
+    glyph = contour.glyph
+    if glyph is None:
+        return points2segments(contour.points)
+    return _segments.get(glyph, contour.index)
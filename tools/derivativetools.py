@@ -1,28 +1,198 @@
 """ Font tools for calculating derivative and using it.
 
-Last modified date: 2019/08/17
+Last modified date: 2026/10/18
 
 Created by Seongju Woo.
 """
 import math
+from collections import namedtuple
 import numpy as np
 import bezier
-from fwig.tools import appendtools
+from fwig.tools import appendtools, beziertools as bt
+from fwig.tools.glyphcache import GlyphCache
+
+Tangents = namedtuple('Tangents', ['contours', 'indexes', 'positions', 'tangents', 'normals'])
 
 def _calculate_distance(point_1, point_2):
     return math.sqrt(pow(point_1[0]-point_2[0], 2)
                      + pow(point_1[1]-point_2[1], 2))
 
 def _is_curve_meet(curve_1, curve_2):
-    if curve_2.intersect(curve_1)[0, :]:
-        return True
-    return False
+    return curve_2.intersect(curve_1).shape[1] > 0
+
+def _points2arrays(points):
+    coordinates = np.array([(point.x, point.y) for point in points], dtype=float).reshape(-1, 2)
+    on_curve = np.array([point.type != 'offcurve' for point in points], dtype=bool)
+    return coordinates, on_curve
+
+def _tangent_vectors(coordinates, indexes, side='in'):
+    """ Returns tangent vectors at coordinates[indexes] of a closed contour.
+
+    The tangent of an on-curve point is the hodograph of its incoming(or
+    outgoing) segment at the point, which is parallel to the nearest distinct
+    control point. So it is the difference with the first distinct point
+    among the 3 neighbouring points.
+    """
+    count = len(coordinates)
+    step = -1 if side == 'in' else 1
+    tangents = np.full((len(indexes), 2), np.nan)
+    remain = np.ones(len(indexes), dtype=bool)
+    for distance in range(1, min(count, 4)):
+        neighbours = coordinates[(indexes + step*distance) % count]
+        vectors = (coordinates[indexes] - neighbours) * -step
+        found = remain & np.any(vectors != 0, axis=1)
+        tangents[found] = vectors[found]
+        remain &= ~found
+    return tangents
+
+def _unit(vectors):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return vectors / np.hypot(vectors[:, 0], vectors[:, 1])[:, np.newaxis]
+
+def contour_tangents(contour, side='in'):
+    """ Calculates tangents and normals of every on-curve point of a contour.
+
+    The values are calculated from the derivative of each Bezier segment at
+    its end point, so there is no approximation and vertical tangents work.
+
+    Args:
+        contour:: RContour or [RPoint, RPoint, ...]
+            The RContour object or its points.
+        side:: str (default is 'in')
+            'in' uses the segment that ends at the point, 'out' uses the segment
+            that starts at the point.
+
+    Returns:
+        tangents:: Tangents
+            A named tuple of numpy.ndarray. 'indexes' are indexes of on-curve
+            points in contour.points, 'positions', 'tangents'(unit vectors) and
+            'normals'(tangents rotated by 90 degrees counterclockwise) are N x 2.
+            'contours' is zeros. Degenerate points have NaN vectors.
+
+    Examples:
+        from fontParts.world import CurrentGlyph
+        tangents = contour_tangents(CurrentGlyph().contours[0])
+        tangents.normals[tangents.indexes == 3]
+    """
+    points = contour.points if hasattr(contour, 'points') else contour
+    coordinates, on_curve = _points2arrays(points)
+    indexes = np.flatnonzero(on_curve)
+    tangents = _unit(_tangent_vectors(coordinates, indexes, side))
+    normals = np.column_stack((-tangents[:, 1], tangents[:, 0]))
+    return Tangents(np.zeros(len(indexes), dtype=int), indexes, coordinates[indexes],
+                    tangents, normals)
+
+def glyph_tangents(glyph, side='in'):
+    """ Calculates tangents and normals of every on-curve point of a glyph.
+
+    Args:
+        glyph:: RGlyph
+            The RGlyph object.
+        side:: str (default is 'in')
+            See contour_tangents().
+
+    Returns:
+        tangents:: Tangents
+            Same as contour_tangents(), and 'contours' are contour indexes.
+    """
+    results = [contour_tangents(contour, side) for contour in glyph.contours]
+    if not results:
+        empty = np.zeros((0, 2))
+        return Tangents(np.zeros(0, dtype=int), np.zeros(0, dtype=int), empty, empty, empty)
+    return Tangents(np.concatenate([np.full(len(result.indexes), i) \
+                                    for i, result in enumerate(results)]),
+                    *[np.concatenate(arrays) for arrays in list(zip(*results))[1:]])
+
+class SegmentIndex:
+    """ Bounding boxes of cubic segments of a contour for line queries.
+
+    The bounding box of the control points contains the curve, so a line
+    that misses the box can not meet the curve.
+
+    Args:
+        segments:: [Segment, Segment, ...]
+            Segments of the contour(see beziertools.get_segments()). Only
+            cubic segments are indexed.
+
+    Attributes:
+        ends:: numpy.ndarray (int)
+            Indexes(at points) of the end point of each cubic segment.
+        nodes:: numpy.ndarray (float, K x 4 x 2)
+            Control points of each cubic segment.
+        boxes:: numpy.ndarray (float, K x 4)
+            (min x, min y, max x, max y) of each cubic segment.
+    """
+    def __init__(self, segments):
+        cubics = [segment for segment in segments if segment.degree == 3]
+        self.ends = np.array([segment.end for segment in cubics], dtype=int)
+        self.nodes = np.array([segment.nodes.T for segment in cubics]).reshape(-1, 4, 2)
+        self.boxes = np.concatenate((self.nodes.min(axis=1, initial=np.inf),
+                                     self.nodes.max(axis=1, initial=-np.inf)), axis=1)
+
+    def candidates(self, origin, direction, length):
+        """ Finds segments that the line may meet, nearest first.
+
+        Args:
+            origin:: (float, float)
+                The middle of the line.
+            direction:: (float, float)
+                The unit direction vector of the line.
+            length:: float
+                The line extends this length to both sides of origin.
+
+        Returns:
+            segment numbers and lower bounds:: (numpy.ndarray, numpy.ndarray)
+                Numbers of segments whose box meets the line, and the lower
+                bound of distance from origin to the meeting point, sorted by
+                the lower bound.
+        """
+        origin = np.asarray(origin, dtype=float)
+        direction = np.asarray(direction, dtype=float)
+        near = np.full(len(self.boxes), -np.inf)
+        far = np.full(len(self.boxes), np.inf)
+        for axis in range(2):
+            low, high = self.boxes[:, axis], self.boxes[:, axis+2]
+            if direction[axis] == 0:
+                outside = (origin[axis] < low) | (origin[axis] > high)
+                near[outside], far[outside] = np.inf, -np.inf
+                continue
+            t_1 = (low - origin[axis]) / direction[axis]
+            t_2 = (high - origin[axis]) / direction[axis]
+            near = np.maximum(near, np.minimum(t_1, t_2))
+            far = np.minimum(far, np.maximum(t_1, t_2))
+        meet = (near <= far) & (far >= -length) & (near <= length)
+        lower = np.where((near <= 0) & (far >= 0), 0, np.minimum(np.abs(near), np.abs(far)))
+        numbers = np.flatnonzero(meet)
+        order = np.argsort(lower[numbers], kind='stable')
+        return numbers[order], lower[numbers][order]
+
+def _build_segment_index(glyph, contour_index):
+    return SegmentIndex(bt.get_segments(glyph.contours[contour_index]))
+
+_segment_indexes = GlyphCache(_build_segment_index)
+
+def get_segment_index(contour):
+    """ Gets the SegmentIndex of RContour object.
+
+    The index is cached until the glyph of the contour changes.
+
+    Args:
+        contour:: RContour
+            The RContour object.
+
+    Returns:
+        segment index:: SegmentIndex
+    """
+    glyph = contour.glyph
+    if glyph is None:
+        return SegmentIndex(bt.get_segments(contour))
+    return _segment_indexes.get(glyph, contour.index)
 
 def calculate_derivative(contour_points, target_index):
     """ Calculates derivative.
 
-    Calculates the derivative of the current point(contour_points[target_index])
-    and returned it.
+    Calculates the derivative(dy/dx) of the curve that ends at the current
+    point(contour_points[target_index]) and returned it.
 
     Args:
         contour_points:: [RPoint, RPoint, ...]
@@ -31,37 +201,15 @@ def calculate_derivative(contour_points, target_index):
             Index(at contour_points) of RPoint to be derivative.
 
     Returns:
-        derivative value:: int
-            The result of derivative calculating.
+        derivative value:: float
+            The result of derivative calculating. It is infinity if the
+            tangent is vertical.
     """
-    # Makes currrent point's bezier instance.
-    nodes = np.asfortranarray([
-        [float(contour_points[target_index+i].x) for i in range(-3, 1)],
-        [float(contour_points[target_index+i].y) for i in range(-3, 1)]
-        ])
-    # Extends the curve for the derivative function.
-    curve = bezier.Curve(nodes, degree=3).specialize(0, 1.5)
-
-    # Calculates two x value for the derivative function.
-    # These are the values from the original value plus and minus the very
-    # small value(1e-4).
-    current_x, _ = contour_points[target_index].position
-    delta_x = 1e-4
-    line_1 = bezier.Curve(np.asfortranarray([
-        [current_x + delta_x, current_x + delta_x],
-        [-1000, 1000]
-        ]), degree=1)
-    line_2 = bezier.Curve(np.asfortranarray([
-        [current_x - delta_x, current_x - delta_x],
-        [-1000, 1000]
-        ]), degree=1)
-
-    # Finds the y value that corresponds to the x value.
-    prev_derivative = curve.evaluate(curve.intersect(line_1)[0, :][0])[1][0]
-    next_derivative = curve.evaluate(curve.intersect(line_2)[0, :][0])[1][0]
-
-    # Returns derivative function value.
-    return (prev_derivative-next_derivative) / (2*delta_x)
+    coordinates, _ = _points2arrays(contour_points)
+    d_x, d_y = _tangent_vectors(coordinates, np.array([target_index % len(coordinates)]))[0]
+    if d_x == 0:
+        return math.copysign(math.inf, d_y)
+    return d_y / d_x
 
 def append_point_by_derivative(contour_points, target_index, target_contour):
     """ Appends point to opposite curve by using derivative.
@@ -93,52 +241,79 @@ def append_point_by_derivative(contour_points, target_index, target_contour):
 
         append_point_by_derivative(contour_points,target_index,target_contour)
     """
+    request = _derivative_request(contour_points, target_index, target_contour)
+    if request is not None:
+        appendtools.append_points(target_contour, [request])
+
+def append_points_by_derivative(contour_points, target_indexes, target_contour):
+    """ Appends points to opposite curves for many RPoints at once.
+
+    Every point is found on target_contour before appending, and they are
+    appended by one appendtools.append_points() call.
+
+    Args:
+        contour_points:: [RPoint, RPoint, ...]
+            RContour's points(RPoint objects) to be derivative.
+        target_indexes:: [int, int, ...]
+            Indexes(at contour_points) of RPoints to be derivative.
+        target_contour: RContour
+            RContour object which containing the opposite curves.
+
+    Examples:
+        from fontParts.world import CurrentGlyph
+        glyph = CurrentGlyph()
+
+        contour_points = glyph.contours[0].points
+        append_points_by_derivative(contour_points, [3, 6, 9], glyph.contours[1])
+    """
+    requests = [_derivative_request(contour_points, target_index, target_contour)
+                for target_index in target_indexes]
+    appendtools.append_points(target_contour, [request for request in requests
+                                               if request is not None])
+
+def _derivative_request(contour_points, target_index, target_contour):
+    """ Returns (points of the nearest curve, rate) to append at, or None. """
     target_contour_points = target_contour.points
     distance = 0xFFFFFF
     points_to_append, rate = None, 0
     x_value, y_value = contour_points[target_index].position
 
-    try:
-        # Calculates gradient by derivative.
-        gradient = -1 / calculate_derivative(contour_points, target_index)
-        # Line's equation.
-        linear_function = lambda x: gradient*x + y_value - (x_value*gradient)
-        # Extends 500 up and down from standard point.
-        line = bezier.Curve(np.asfortranarray([
-            [x_value+500, x_value-500],
-            [linear_function(x_value+500), linear_function(x_value-500)]
-            ]), degree=1)
-    except ZeroDivisionError:
-        line = bezier.Curve(np.asfortranarray([
-            [x_value, x_value],
-            [float(y_value+500), float(y_value-500)]
-            ]), degree=1)
-
-    # Finds what curve in target contour is meeted with line.
-    for i, _ in enumerate(target_contour_points):
-        if i == target_index and target_contour_points == contour_points:
+    # Normal line of the current point. Extends 500 to the left and right
+    # from standard point, or 500 up and down if the normal line is vertical.
+    coordinates, _ = _points2arrays(contour_points)
+    tangent = _unit(_tangent_vectors(coordinates, np.array([target_index % len(coordinates)])))[0]
+    if np.isnan(tangent).any():
+        return
+    normal = np.array([-tangent[1], tangent[0]])
+    length = 500 / abs(normal[0]) if normal[0] else 500
+    line = bezier.Curve(np.asfortranarray([
+        [x_value + normal[0]*length, x_value - normal[0]*length],
+        [y_value + normal[1]*length, y_value - normal[1]*length]
+        ]), degree=1)
+
+    # Finds what curve in target contour is meeted with line. Segments are
+    # visited from the nearest box, and stops when no box can be nearer.
+    is_same_contour = target_contour_points == contour_points
+    segment_index = get_segment_index(target_contour)
+    for number, lower_bound in zip(*segment_index.candidates((x_value, y_value), normal, length)):
+        if lower_bound >= distance:
+            break
+        i = int(segment_index.ends[number])
+        if is_same_contour and i == target_index % len(target_contour_points):
             continue
-        if target_contour_points[i].type != 'offcurve' \
-                and target_contour_points[i-1].type == 'offcurve':
-            nodes = np.asfortranarray([
-                [float(target_contour_points[i+j].x) for j in range(-3, 1)],
-                [float(target_contour_points[i+j].y) for j in range(-3, 1)]
-                ])
-            curve = bezier.Curve(nodes, degree=3)
-
-            # If line meet curve.
-            if _is_curve_meet(line, curve):
-                meeting_object = curve.evaluate(curve.intersect(line)[0, :][0])
-                meeting_point = tuple(meeting_object.flatten())
-                new_distance = _calculate_distance( \
-                        contour_points[target_index].position, meeting_point)
-                # Finds nearest curve.
-                if new_distance < distance:
-                    distance = new_distance
-                    points_to_append = [target_contour_points[i+j] \
-                                        for j in range(-3, 1)]
-                    rate = curve.locate(meeting_object)
-
-    # Appends point at target curve.
+        curve = bezier.Curve(np.asfortranarray(segment_index.nodes[number].T), degree=3)
+        intersections = curve.intersect(line)
+        # If line meet curve.
+        if intersections.shape[1]:
+            meeting_object = curve.evaluate(intersections[0, 0])
+            meeting_point = tuple(meeting_object.flatten())
+            new_distance = _calculate_distance((x_value, y_value), meeting_point)
+            # Finds nearest curve.
+            if new_distance < distance:
+                distance = new_distance
+                points_to_append = [target_contour_points[i+j] for j in range(-3, 1)]
+                rate = curve.locate(meeting_object)
+
     if points_to_append and rate:
-        appendtools.append_point_rate(target_contour, points_to_append, rate)
+        return points_to_append, rate
+    return None
@@ -1,11 +1,16 @@
 """ Font tools for extending line or curve object.
 
-Last modified date: 2019/08/09
+Last modified date: 2026/10/18
 
 Created by Seongju Woo.
 """
 import numpy as np
-import bezier
+from fwig.tools import intersecttools as it
+
+# extend_curve() looks for the target on the curve up to this parameter, and
+# on the perpendicular line between these coordinates.
+_EXTEND_LIMIT = 2.5
+_LINE_RANGE = (0., 1000.)
 
 class _InputError(Exception):
     def __init__(self, expression, message):
@@ -66,6 +71,160 @@ def get_linear_function(coordinates_1, coordinates_2, x_or_y):
 
     return linear_function
 
+def _check_x_or_y(x_or_y):
+    x_or_y = _make_lower_string(x_or_y)
+    if x_or_y not in ('x', 'y'):
+        raise _InputError("x_or_y: " + x_or_y, "Put 'x' or 'y'")
+    return x_or_y
+
+def _base_values(base_values, count):
+    return np.broadcast_to(np.asarray(base_values, dtype=float), (count,))
+
+def _write_positions(points, positions):
+    """ Moves points, holding change notifications of each glyph until all
+    points are moved.
+    """
+    held = {}
+    for point in points:
+        glyph = point.glyph
+        naked = glyph.naked() if glyph is not None else None
+        if getattr(naked, 'holdNotifications', None) is not None and id(naked) not in held:
+            naked.holdNotifications()
+            held[id(naked)] = naked
+    try:
+        for point, position in zip(points, positions):
+            point.position = (float(position[0]), float(position[1]))
+    finally:
+        for naked in held.values():
+            naked.releaseHeldNotifications()
+
+def extend_lines(lines, base_values, x_or_y, apply_extend=True):
+    """ Extends many lines to the given values at once.
+
+    Args:
+        lines:: [(RPoint, RPoint), ...]
+            (start point, end point) of each line. Lines extend from the end
+            point.
+        base_values:: int or [int, ...]
+            The coordinate value of how far you want to extend each line.
+            One value is used for all lines.
+        x_or_y:: str
+            If base_values are x coordinate values, type 'x'.
+            If they are y coordinate values, type 'y'.
+        apply_extend:: bool (default is True)
+            If it is True, all end points are moved together at the end.
+
+    Examples:
+        from fontParts.world import CurrentFont
+        from fwig.tools import extendtools as et
+
+        # Extends the last line of every contour to the descender.
+        lines = [(contour.points[-2], contour.points[-1])
+                 for glyph in CurrentFont() for contour in glyph.contours]
+        et.extend_lines(lines, CurrentFont().info.descender, 'y')
+
+    Returns:
+        extend_points:: numpy.ndarray (float, N x 2)
+            The coordinate values of the results of the extension.
+    """
+    x_or_y = _check_x_or_y(x_or_y)
+    lines = list(lines)
+    coordinates = np.array([(start_point.position, end_point.position)
+                            for start_point, end_point in lines], dtype=float).reshape(-1, 2, 2)
+    base_values = _base_values(base_values, len(lines))
+    axis = 0 if x_or_y == 'x' else 1
+    starts, ends = coordinates[:, 0], coordinates[:, 1]
+    differences = ends - starts
+    is_parallel = differences[:, axis] == 0
+    if is_parallel.any():
+        number = int(np.flatnonzero(is_parallel)[0])
+        raise _InputError(f"x_or_y: {x_or_y}, coordinates: {tuple(map(tuple, coordinates[number]))}", \
+                         "Not possible to get result because line is horizental or vertical")
+
+    extend_points = np.empty((len(lines), 2))
+    extend_points[:, axis] = base_values
+    extend_points[:, 1-axis] = starts[:, 1-axis] \
+            + (base_values - starts[:, axis]) * differences[:, 1-axis] / differences[:, axis]
+
+    if apply_extend:
+        _write_positions([end_point for _, end_point in lines], extend_points)
+
+    return extend_points
+
+def _specialize(nodes, t_values):
+    """ Nodes(N x 4 x 2) of curves from 0 to t_values by de Casteljau's algorithm. """
+    t_values = t_values[:, np.newaxis]
+    p_0, p_1, p_2, p_3 = np.moveaxis(nodes, 1, 0)
+    p_01, p_12, p_23 = p_0 + (p_1-p_0)*t_values, p_1 + (p_2-p_1)*t_values, p_2 + (p_3-p_2)*t_values
+    p_012, p_123 = p_01 + (p_12-p_01)*t_values, p_12 + (p_23-p_12)*t_values
+    return np.stack((p_0, p_01, p_012, p_012 + (p_123-p_012)*t_values), axis=1)
+
+def extend_curves(curves, base_values, x_or_y, apply_extend=True):
+    """ Extends many cubic curves to the given values at once.
+
+    Each curve is extended(or shortened) from its end point until it reaches
+    the base value. The parameter is found in closed form as the root of a
+    cubic equation in x or y, within 2.5 times the curve and with the other
+    coordinate in [0, 1000]. If there are many, the first one from the start
+    point is used.
+
+    Args:
+        curves:: [[RPoint, RPoint, RPoint, RPoint], ...]
+            4 RPoint objects forming each cubic bezier curve. The order is
+            [(start point), (control point1), (control point2), (end point)].
+        base_values:: int or [int, ...]
+            The coordinate value of how far you want to extend each curve.
+            One value is used for all curves.
+        x_or_y:: str
+            If base_values are x coordinate values, type 'x'.
+            If they are y coordinate values, type 'y'.
+        apply_extend:: bool (default is True)
+            If it is True, all curves that reach their base value are changed
+            together at the end.
+
+    Returns:
+        nodes:: Nx2x4 numpy.ndarray (float)
+            The coordinate values of the results of the extension, laid out
+            like the result of extend_curve(). Curves that can not reach
+            their base value are NaN and not changed.
+    """
+    x_or_y = _check_x_or_y(x_or_y)
+    curves = [list(curve) for curve in curves]
+    for curve in curves:
+        if len(curve) != 4:
+            raise _InputError('curve_point_list: ' + str(curve), \
+                             "The number of data is not correct. Need 4 RPoint objects in the list")
+    nodes = np.array([[point.position for point in curve] for curve in curves],
+                     dtype=float).reshape(-1, 4, 2)
+    base_values = _base_values(base_values, len(curves))
+    axis = 0 if x_or_y == 'x' else 1
+
+    # Power coefficients of (coordinate - base value) in t.
+    p_0, p_1, p_2, p_3 = np.moveaxis(nodes[:, :, axis], 1, 0)
+    coefficients = np.stack((-p_0 + 3*p_1 - 3*p_2 + p_3, 3*p_0 - 6*p_1 + 3*p_2,
+                             -3*p_0 + 3*p_1, p_0 - base_values), axis=1)
+    numbers, t_values = it.solve_cubic(coefficients)
+    others = it.evaluate(nodes[numbers], t_values)[:, 1-axis]
+    is_valid = (t_values >= 0) & (t_values <= _EXTEND_LIMIT) \
+               & (others >= _LINE_RANGE[0]) & (others <= _LINE_RANGE[1])
+    numbers, t_values = numbers[is_valid], t_values[is_valid]
+
+    # The first root from the start point of each curve.
+    order = np.lexsort((t_values, numbers))
+    numbers, t_values = numbers[order], t_values[order]
+    is_first = np.ones(len(numbers), dtype=bool)
+    is_first[1:] = numbers[1:] != numbers[:-1]
+    reached = numbers[is_first]
+    result = np.full(nodes.shape, np.nan)
+    result[reached] = _specialize(nodes[reached], t_values[is_first])
+    result[reached, 3, axis] = base_values[reached]
+
+    if apply_extend:
+        _write_positions([point for number in reached for point in curves[number]],
+                         result[reached].reshape(-1, 2))
+
+    return result.transpose(0, 2, 1)
+
 def extend_line(start_point, end_point, base_value, x_or_y, apply_extend=True):
     """ Extends the line to the given value.
 
@@ -88,20 +247,8 @@ def extend_line(start_point, end_point, base_value, x_or_y, apply_extend=True):
         extend_point:: (int, int)
             The coordinate value of the result of the extension.
     """
-    x_or_y = _make_lower_string(x_or_y)
-
-    linear_function = get_linear_function(start_point.position, end_point.position, x_or_y)
-    if x_or_y == 'x':
-        extend_point = (base_value, linear_function(base_value))
-    elif x_or_y == 'y':
-        extend_point = (linear_function(base_value), base_value)
-    else:
-        raise _InputError("x_or_y: " + x_or_y, "Put 'x' or 'y'")
-
-    if apply_extend:
-        end_point.position = extend_point
-
-    return extend_point
+    extend_points = extend_lines([(start_point, end_point)], base_value, x_or_y, apply_extend)
+    return tuple(extend_points[0])
 
 def extend_curve(curve_point_list, base_value, x_or_y, apply_extend=True):
     """ Extends the curve to the given value.
@@ -134,30 +281,8 @@ def extend_curve(curve_point_list, base_value, x_or_y, apply_extend=True):
     if len(curve_point_list) != 4:
         raise _InputError('curve_point_list: ' + str(curve_point_list), \
                          "The number of data is not correct. Need 4 RPoint objects in the list")
-
-    curve_x = [float(point.x) for point in curve_point_list]
-    curve_y = [float(point.y) for point in curve_point_list]
-    base_value = float(base_value)
-    nodes = np.asfortranarray([curve_x, curve_y])
-    curve = bezier.Curve(nodes, degree=3)
-    new_curve = curve.specialize(0, 2.5)
-
-    x_or_y = _make_lower_string(x_or_y)
-    if x_or_y == 'y':
-        nodes = np.asfortranarray([[0., 1000.], [base_value, base_value]])
-    elif x_or_y == 'x':
-        nodes = np.asfortranarray([[base_value, base_value], [0., 1000.]])
-    else:
-        raise _InputError("x_or_y: " + x_or_y, "Put 'x' or 'y'")
-
-    line = bezier.Curve(nodes, degree=1)
-    s_vals = new_curve.intersect(line)[0, :]
-    point = new_curve.evaluate(s_vals[0])
-    rate = new_curve.locate(point)
-    result_curve = new_curve.specialize(0, rate)
-
-    if apply_extend:
-        for i in range(4):
-            curve_point_list[i].position = (result_curve.nodes[0, i], result_curve.nodes[1, i])
-
-    return result_curve.nodes
+    nodes = extend_curves([curve_point_list], base_value, x_or_y, apply_extend)[0]
+    if np.isnan(nodes).any():
+        raise _InputError(f"base_value: {base_value}, x_or_y: {x_or_y}", \
+                         "The curve does not reach base_value")
+    return np.asfortranarray(nodes)
@@ -0,0 +1,397 @@
+""" Columnar in-memory snapshot of UFO format font data.
+
+Reads the outlines of every glyph into flat NumPy arrays without creating
+fontParts objects, so that read-only analyses can run on large CJK fonts
+quickly. Points of glyph g are points[glyph_point_offsets[g]:glyph_point_offsets[g+1]]
+and points of contour c are points[contour_offsets[c]:contour_offsets[c+1]].
+
+The arrays can be cached in a directory next to the UFO(<ufo path>.fwigcache).
+Each .glif file is keyed by its mtime and size, so only changed glyphs are
+parsed again and an unchanged font is loaded from memory-mapped files.
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
+import os
+import json
+import plistlib
+import tempfile
+import shutil
+import numpy as np
+from fwig.tools import attributetools as at, glif
+
+_CACHE_VERSION = 1
+_CACHE_ARRAYS = ('widths', 'glyph_contour_offsets', 'contour_offsets',
+                 'coordinates', 'types', 'smooth', 'name_ids')
+
+def cache_path(path) -> str:
+    """ Returns the path of the snapshot cache of UFO format font data.
+
+    Args:
+        path:: str
+            A path of the UFO format font data.
+    """
+    return os.path.normpath(path) + '.fwigcache'
+
+def clear_cache(path):
+    """ Removes the snapshot cache of UFO format font data.
+
+    Args:
+        path:: str
+            A path of the UFO format font data.
+    """
+    shutil.rmtree(cache_path(path), ignore_errors=True)
+
+def _read_contents(glyphs_path):
+    contents_path = os.path.join(glyphs_path, 'contents.plist')
+    if os.path.exists(contents_path):
+        with open(contents_path, 'rb') as file_:
+            return list(plistlib.load(file_).items())
+    return [(os.path.splitext(file)[0], file) for file in sorted(os.listdir(glyphs_path)) \
+                                              if file.endswith('.glif')]
+
+def _read_glif(file_path):
+    """ Returns (width, contour lengths, coordinates, types, smooth, names) of a .glif file. """
+    glyph = glif.read_file(file_path)
+    return (glyph.width, glyph.contour_lengths, glyph.coordinates, glyph.types,
+            glyph.smooth, glyph.names)
+
+def _file_stats(glyphs_path, files):
+    stats = []
+    for file in files:
+        stat = os.stat(os.path.join(glyphs_path, file))
+        stats.append([stat.st_mtime_ns, stat.st_size])
+    return stats
+
+def _load_array(path):
+    try:
+        return np.load(path, mmap_mode='c')
+    except ValueError:
+        # Empty arrays can not be memory-mapped.
+        return np.load(path)
+
+def _load_cache(path):
+    directory = cache_path(path)
+    try:
+        with open(os.path.join(directory, 'index.json'), encoding='utf-8') as file_:
+            index = json.load(file_)
+        if index.get('version') != _CACHE_VERSION:
+            return None
+        arrays = {name: _load_array(os.path.join(directory, name + '.npy')) \
+                  for name in _CACHE_ARRAYS}
+    except (OSError, ValueError):
+        return None
+    if len(arrays['coordinates']) != index['point_count']:
+        return None
+    names = np.array(index['name_table'] + [None], dtype=object)
+    arrays['names'] = names[arrays.pop('name_ids')]
+    index['arrays'] = arrays
+    return index
+
+
+class FontSnapshot:
+    """ Flat arrays of every glyph outline in UFO format font data.
+
+    Args:
+        path:: str
+            A path of the UFO format font data.
+        cache:: bool (default is False)
+            If this is True, uses and updates the snapshot cache next to the UFO.
+
+    Attributes:
+        glyph_names:: list
+            Glyph names in the order of contents.plist.
+        widths:: numpy.ndarray (float, G)
+            Advance widths of glyphs.
+        glyph_contour_offsets:: numpy.ndarray (int, G+1)
+            Offsets of each glyph's contours in contour_offsets.
+        glyph_point_offsets:: numpy.ndarray (int, G+1)
+            Offsets of each glyph's points in the point arrays.
+        contour_offsets:: numpy.ndarray (int, C+1)
+            Offsets of each contour's points in the point arrays.
+        coordinates:: numpy.ndarray (float, N x 2)
+            x and y of every point.
+        types:: numpy.ndarray (int8, N)
+            Point types as indexes of glif.POINT_TYPES.
+        smooth:: numpy.ndarray (bool, N)
+            Smooth flags of points.
+        names:: numpy.ndarray (object, N)
+            Point names, None if the point has no name.
+
+    Examples:
+        >>> from fwig.tools.fontsnapshot import FontSnapshot
+        >>> snapshot = FontSnapshot('Yullyeo.ufo', cache=True)
+        >>> glyph = snapshot.glyph_index('uniAC00')
+        >>> snapshot.glyph_coordinates(glyph).shape
+        (94, 2)
+        >>> snapshot.attribute('penPair')[snapshot.glyph_points(glyph)][:2]
+        array(['z1r', None], dtype=object)
+        >>> snapshot.coordinates[snapshot.glyph_points(glyph)] += (10, 0)
+        >>> snapshot.save()
+    """
+    def __init__(self, path, cache=False):
+        self.path = path
+        self.cache = cache
+        glyphs_path = os.path.join(path, 'glyphs')
+        contents = _read_contents(glyphs_path)
+        self.glyph_names = [name for name, _ in contents]
+        self.files = [file for _, file in contents]
+        if not cache:
+            self._set_glyphs([_read_glif(os.path.join(glyphs_path, file)) \
+                              for file in self.files])
+            return
+        stats = _file_stats(glyphs_path, self.files)
+        cached = _load_cache(path)
+        if cached is not None and cached['files'] == self.files and cached['stats'] == stats:
+            self._set_arrays(**cached['arrays'])
+            return
+        self._set_glyphs(self._reuse_cached_glyphs(cached, stats))
+        self._write_cache(stats)
+
+    def _reuse_cached_glyphs(self, cached, stats):
+        glyphs_path = os.path.join(self.path, 'glyphs')
+        cached_glyphs = {}
+        if cached is not None:
+            cached_glyphs = {(file, tuple(stat)): index for index, (file, stat) \
+                             in enumerate(zip(cached['files'], cached['stats']))}
+        glyphs = []
+        for file, stat in zip(self.files, stats):
+            index = cached_glyphs.get((file, tuple(stat)))
+            if index is None:
+                glyphs.append(_read_glif(os.path.join(glyphs_path, file)))
+                continue
+            arrays = cached['arrays']
+            contour_offsets = arrays['contour_offsets'][arrays['glyph_contour_offsets'][index]: \
+                                                        arrays['glyph_contour_offsets'][index+1]+1]
+            points = slice(contour_offsets[0], contour_offsets[-1])
+            glyphs.append((arrays['widths'][index], np.diff(contour_offsets),
+                           arrays['coordinates'][points], arrays['types'][points],
+                           arrays['smooth'][points], arrays['names'][points]))
+        return glyphs
+
+    def _write_cache(self, stats):
+        directory = cache_path(self.path)
+        parent = os.path.dirname(directory) or '.'
+        temp_directory = tempfile.mkdtemp(prefix='.fwigcache-', dir=parent)
+        try:
+            name_ids, name_table = {}, []
+            for name in self.names.tolist():
+                if name is not None and name not in name_ids:
+                    name_ids[name] = len(name_table)
+                    name_table.append(name)
+            arrays = {'widths': self.widths,
+                      'glyph_contour_offsets': self.glyph_contour_offsets,
+                      'contour_offsets': self.contour_offsets,
+                      'coordinates': self.coordinates,
+                      'types': self.types,
+                      'smooth': self.smooth,
+                      'name_ids': np.array([-1 if name is None else name_ids[name] \
+                                            for name in self.names.tolist()], dtype=np.int32)}
+            for name, array in arrays.items():
+                np.save(os.path.join(temp_directory, name + '.npy'), np.asarray(array))
+            with open(os.path.join(temp_directory, 'index.json'), 'w', encoding='utf-8') as file_:
+                json.dump({'version': _CACHE_VERSION, 'files': self.files, 'stats': stats,
+                           'point_count': len(self.coordinates), 'name_table': name_table},
+                          file_, ensure_ascii=False)
+            old_directory = None
+            if os.path.exists(directory):
+                old_directory = tempfile.mkdtemp(prefix='.fwigcache-old-', dir=parent)
+                os.replace(directory, os.path.join(old_directory, 'cache'))
+            os.replace(temp_directory, directory)
+            if old_directory is not None:
+                shutil.rmtree(old_directory, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(temp_directory, ignore_errors=True)
+            raise
+
+    def _set_glyphs(self, glyphs):
+        point_counts = [counts for _, counts, _, _, _, _ in glyphs]
+        contour_offsets = np.cumsum(np.concatenate([[0]] + point_counts)).astype(np.int64)
+        glyph_contour_offsets = np.cumsum([0] + [len(counts) for counts in point_counts])
+        empty = np.zeros((0, 2))
+        self._set_arrays(
+            widths=np.array([glyph[0] for glyph in glyphs], dtype=float),
+            glyph_contour_offsets=glyph_contour_offsets.astype(np.int64),
+            contour_offsets=contour_offsets,
+            coordinates=np.concatenate([empty] + [glyph[2] for glyph in glyphs]),
+            types=np.concatenate([np.zeros(0, np.int8)] + [glyph[3] for glyph in glyphs]),
+            smooth=np.concatenate([np.zeros(0, bool)] + [glyph[4] for glyph in glyphs]),
+            names=np.concatenate([np.zeros(0, object)] + [glyph[5] for glyph in glyphs]))
+
+    def _set_arrays(self, widths, glyph_contour_offsets, contour_offsets,
+                    coordinates, types, smooth, names):
+        self._glyph_indexes = {name: index for index, name in enumerate(self.glyph_names)}
+        self.widths = widths
+        self.glyph_contour_offsets = glyph_contour_offsets
+        self.contour_offsets = contour_offsets
+        self.glyph_point_offsets = contour_offsets[glyph_contour_offsets]
+        self.coordinates = coordinates
+        self.types = types
+        self.smooth = smooth
+        self.names = names
+        self._columns = None
+        self._mark_saved()
+
+    def _mark_saved(self):
+        self._saved_coordinates = self.coordinates.copy()
+        self._saved_names = self.names.copy()
+
+    def __len__(self):
+        return len(self.glyph_names)
+
+    def glyph_index(self, glyph_name) -> int:
+        """ Returns the index of glyph.
+
+        Args:
+            glyph_name:: str
+        """
+        return self._glyph_indexes[glyph_name]
+
+    def glyph_points(self, glyph) -> slice:
+        """ Returns the slice of the glyph's points in the point arrays.
+
+        Args:
+            glyph:: int
+                The index of glyph.
+        """
+        return slice(self.glyph_point_offsets[glyph], self.glyph_point_offsets[glyph+1])
+
+    def glyph_contours(self, glyph) -> list:
+        """ Returns the slices of the glyph's contours in the point arrays.
+
+        Args:
+            glyph:: int
+                The index of glyph.
+        """
+        offsets = self.contour_offsets[self.glyph_contour_offsets[glyph]: \
+                                       self.glyph_contour_offsets[glyph+1] + 1].tolist()
+        return [slice(start, end) for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def glyph_coordinates(self, glyph) -> np.ndarray:
+        """ Returns the N x 2 coordinates of the glyph's points.
+
+        Args:
+            glyph:: int
+                The index of glyph.
+        """
+        return self.coordinates[self.glyph_points(glyph)]
+
+    def attribute(self, key) -> np.ndarray:
+        """ Returns the column of a point attribute.
+
+        Args:
+            key:: str
+                The key of attribute. For example, 'penPair'.
+
+        Returns:
+            attribute column:: numpy.ndarray (object, N)
+                The values of attribute. None if the point has not the attribute.
+        """
+        if self._columns is None:
+            self._columns = {}
+            parsed = {}
+            for index, name in enumerate(self.names.tolist()):
+                if name is None:
+                    continue
+                attributes = parsed.get(name)
+                if attributes is None:
+                    attributes = parsed[name] = at.name2dict(name)
+                for attr_key, value in attributes.items():
+                    column = self._columns.get(attr_key)
+                    if column is None:
+                        column = self._columns[attr_key] = np.full(len(self.names), None, object)
+                    column[index] = value
+        column = self._columns.get(key)
+        if column is None:
+            return np.full(len(self.names), None, object)
+        return column
+
+    def set_attr(self, point, key, value):
+        """ Sets an attribute of a point.
+
+        Args:
+            point:: int
+                The index of point in the point arrays.
+            key:: str
+                The key of attribute.
+            value:: str
+                The value of attribute. If this is None, deletes the attribute.
+        """
+        attributes = at.name2dict(self.names[point])
+        if value is None:
+            attributes.pop(key, None)
+        else:
+            attributes[key] = value
+        self.names[point] = at.dict2name(attributes) if attributes else None
+        self._columns = None
+
+    def penpair_table(self, glyph) -> np.ndarray:
+        """ Returns the penPair table of the glyph like attributetools.get_penpair_table().
+
+        Args:
+            glyph:: int
+                The index of glyph.
+
+        Returns:
+            penpair_table:: numpy.ndarray (attributetools.PENPAIR_DTYPE)
+        """
+        points = self.glyph_points(glyph)
+        penpairs = self.attribute('penPair')[points]
+        on_curve = self.types[points] != 0
+        contour_offsets = self.contour_offsets[self.glyph_contour_offsets[glyph]: \
+                                               self.glyph_contour_offsets[glyph+1]+1]
+        indexes = np.flatnonzero(on_curve)
+        contours = np.searchsorted(contour_offsets, indexes + points.start, side='right') - 1
+        table = np.zeros(len(indexes), dtype=at.PENPAIR_DTYPE)
+        splits = [(None, -1, '') if penpair is None else at.split_penpair(penpair)
+                  for penpair in penpairs[indexes]]
+        if splits:
+            table['key'], table['pair'], table['side'] = zip(*splits)
+        table['contour'] = contours
+        table['point'] = indexes + points.start - contour_offsets[contours]
+        table['x'], table['y'] = self.coordinates[indexes + points.start].T
+        return table
+
+    def changed_glyphs(self) -> list:
+        """ Returns indexes of glyphs whose coordinates or names were changed. """
+        changed = np.any(self.coordinates != self._saved_coordinates, axis=1) \
+                  | (self.names != self._saved_names)
+        counts = np.concatenate(([0], np.cumsum(changed)))[self.glyph_point_offsets]
+        return np.flatnonzero(np.diff(counts)).tolist()
+
+    def save(self):
+        """ Writes changed coordinates and names back to the .glif files.
+
+        Only glyphs that were changed are rewritten, and each file is
+        replaced atomically.
+        """
+        changed_glyphs = self.changed_glyphs()
+        for glyph in changed_glyphs:
+            self._write_glyph(glyph)
+        self._mark_saved()
+        if self.cache and changed_glyphs:
+            self._write_cache(_file_stats(os.path.join(self.path, 'glyphs'), self.files))
+
+    def _write_glyph(self, glyph):
+        file_path = os.path.join(self.path, 'glyphs', self.files[glyph])
+        glyph_file = glif.read_file(file_path)
+        offset = self.glyph_point_offsets[glyph]
+        changes = {}
+        for index, attributes in enumerate(glyph_file.attributes):
+            x, y = self.coordinates[offset+index].tolist()
+            name = self.names[offset+index]
+            if (x, y) == tuple(glyph_file.coordinates[index].tolist()) \
+                    and name == glyph_file.names[index]:
+                continue
+            attributes = dict(attributes)
+            attributes['x'] = glif.format_number(x)
+            attributes['y'] = glif.format_number(y)
+            if name is None:
+                attributes.pop('name', None)
+            else:
+                attributes['name'] = name
+            changes[index] = attributes
+        data = glyph_file.encode(changes)
+        if data != glyph_file.data:
+            glif.write_file(file_path, data)
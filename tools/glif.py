@@ -0,0 +1,211 @@
+""" Streaming reader and writer of .glif files in UFO format font data.
+
+Points are streamed by expat into compact arrays without building an
+element tree. Writing finds the byte ranges of the tags of changed points
+and replaces only them, copying the other bytes as they are. A file that
+is read and written without changes is written byte-identically.
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
+import os
+import re
+import shutil
+import tempfile
+from xml.parsers import expat
+from xml.sax.saxutils import escape
+import numpy as np
+
+POINT_TYPES = ('offcurve', 'move', 'line', 'curve', 'qcurve')
+TYPE_CODES = {type_: code for code, type_ in enumerate(POINT_TYPES)}
+TYPE_CODES[None] = 0
+
+BASE_ATTRIBUTES = ('x', 'y', 'type', 'smooth')
+
+# The whole tag of a point, '>' in quoted values included.
+POINT_TAG = re.compile(rb'<point\b(?:[^>"\']+|"[^"]*"|\'[^\']*\')*>')
+_ATTRIBUTE_KEY = re.compile(rb'([\w:.-]+)\s*=\s*(?:"[^"]*"|\'[^\']*\')')
+_ESCAPES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#9;'}
+
+
+class Glif:
+    """ Points of a .glif file.
+
+    Args:
+        data:: bytes
+            The bytes of the file.
+        width:: float
+            Advance width of the glyph.
+        contour_lengths:: [int, int, ...]
+            Number of points of each contour.
+        attributes:: [dict, dict, ...]
+            XML attributes of each point in order of the file.
+
+    Attributes:
+        data, width, attributes:: See Args.
+        contour_lengths:: numpy.ndarray (int, C)
+        coordinates:: numpy.ndarray (float, N x 2)
+            x and y of every point.
+        types:: numpy.ndarray (int8, N)
+            Point types as indexes of POINT_TYPES.
+        smooth:: numpy.ndarray (bool, N)
+            Smooth flags of points.
+        names:: numpy.ndarray (object, N)
+            Point names, None if the point has no name.
+    """
+    def __init__(self, data, width, contour_lengths, attributes):
+        self.data = data
+        self.width = width
+        self.attributes = attributes
+        self.contour_lengths = np.array(contour_lengths, dtype=np.int64)
+        self.coordinates = np.fromiter((float(value) for point in attributes
+                                        for value in (point['x'], point['y'])),
+                                       dtype=float, count=2*len(attributes)).reshape(-1, 2)
+        get = dict.get
+        self.types = np.array([TYPE_CODES[get(point, 'type')] for point in attributes],
+                              dtype=np.int8)
+        self.smooth = np.array([get(point, 'smooth') == 'yes' for point in attributes], dtype=bool)
+        self.names = np.empty(len(attributes), dtype=object)
+        self.names[:] = [get(point, 'name') for point in attributes]
+
+    def __len__(self):
+        return len(self.attributes)
+
+    def encode(self, changes=None) -> bytes:
+        """ Returns the bytes of the file with changed points.
+
+        Only tags of points whose attributes are different are written
+        again, so the bytes are the same as data if nothing is changed.
+
+        Args:
+            changes:: {int: dict} (default is None)
+                New XML attributes of points by their indexes.
+
+        Returns:
+            data:: bytes
+        """
+        indexes = [index for index in sorted(changes or ())
+                   if changes[index] != self.attributes[index]]
+        if not indexes:
+            return self.data
+        starts = _point_starts(self.data)
+        pieces, position = [], 0
+        for index in indexes:
+            attributes = changes[index]
+            start, end = POINT_TAG.match(self.data, starts[index]).span()
+            pieces.append(self.data[position:start])
+            pieces.append(point_tag(attributes, self.data[end-2:end] == b'/>'))
+            position = end
+        pieces.append(self.data[position:])
+        return b''.join(pieces)
+
+def point_tag(attributes, is_empty=True) -> bytes:
+    """ Returns the tag of a point with XML attributes in their order.
+
+    Args:
+        attributes:: dict
+            XML attributes of the point.
+        is_empty:: bool (default is True)
+            If this is True, the tag is closed by itself(<point .../>).
+    """
+    text = ''.join(f' {key}="{escape(str(value), _ESCAPES)}"' for key, value in attributes.items())
+    return ('<point' + text + ('/>' if is_empty else '>')).encode('utf-8')
+
+def point_keys(data) -> list:
+    """ Returns XML attribute names of each point without parsing the file.
+
+    Args:
+        data:: bytes
+            The bytes of the .glif file.
+
+    Returns:
+        keys:: [[str, str, ...], ...]
+            Attribute names of each point tag in order of the file.
+    """
+    return [[key.decode() for key in _ATTRIBUTE_KEY.findall(tag)]
+            for tag in POINT_TAG.findall(data)]
+
+def _point_starts(data):
+    """ Byte offsets of the tags of points, found only when writing. """
+    starts = []
+    parser = expat.ParserCreate()
+
+    def start_element(tag, _):
+        if tag == 'point':
+            starts.append(parser.CurrentByteIndex)
+
+    parser.StartElementHandler = start_element
+    parser.Parse(data, True)
+    return starts
+
+def read(data) -> Glif:
+    """ Reads points of a .glif file from its bytes.
+
+    Args:
+        data:: bytes
+            The bytes of the .glif file.
+
+    Examples:
+        >>> from fwig.tools import glif
+        >>> glyph = glif.read_file('Yullyeo.ufo/glyphs/uniA_C00.glif')
+        >>> glyph.coordinates.shape
+        (94, 2)
+        >>> glyph.encode() == glyph.data
+        True
+
+    Returns:
+        glif:: Glif
+    """
+    # Points are only in contours of the outline in .glif files, so the
+    # tags are told apart by their names alone.
+    width, contour_lengths, attributes = 0., [], []
+    append = attributes.append
+
+    def start_element(tag, element_attributes):
+        nonlocal width
+        if tag == 'point':
+            append(element_attributes)
+        elif tag == 'contour':
+            contour_lengths.append(len(attributes))
+        elif tag == 'advance':
+            width = float(element_attributes.get('width', 0))
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start_element
+    parser.Parse(data, True)
+    contour_lengths = np.diff(contour_lengths + [len(attributes)])
+    return Glif(data, width, contour_lengths, attributes)
+
+def read_file(file_path) -> Glif:
+    """ Reads points of a .glif file. See read().
+
+    Args:
+        file_path:: str
+            A path of the .glif file.
+    """
+    with open(file_path, 'rb') as file_:
+        return read(file_.read())
+
+def write_file(file_path, data):
+    """ Replaces a file with bytes atomically, keeping the mode of the file.
+
+    Args:
+        file_path:: str
+            A path of the file.
+        data:: bytes
+            The bytes to write.
+    """
+    fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(file_path))
+    try:
+        with os.fdopen(fd, 'wb') as file_:
+            file_.write(data)
+        shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+def format_number(value) -> str:
+    """ Formats a coordinate like .glif files, integers without a point. """
+    return str(int(value)) if value == int(value) else repr(value)
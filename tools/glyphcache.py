@@ -0,0 +1,107 @@
+""" Caches values computed from RGlyph objects.
+
+A value is computed once per glyph and reused until the glyph changes. Glyphs
+that wrap defcon objects drop their entries by themselves on 'Glyph.Changed'
+notification. For other glyphs, call invalidate() after changing them.
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
+import weakref
+
+_caches = weakref.WeakSet()
+
+def invalidate(glyph):
+    """ Drops every cached value of RGlyph object.
+
+    Args:
+        glyph:: RGlyph
+            The RGlyph object that was changed.
+    """
+    if glyph is None:
+        return
+    key = id(glyph.naked())
+    for cache in list(_caches):
+        cache._drop(key)
+
+def clear():
+    """ Drops every cached value of every glyph. """
+    for cache in list(_caches):
+        cache.clear()
+
+
+class GlyphCache:
+    """ Keeps values built from RGlyph objects until the glyph changes.
+
+    Args:
+        build:: function
+            The function that builds the value. It is called as
+            build(glyph, *args) when the value is not cached.
+
+    Examples:
+        from fwig.tools.glyphcache import GlyphCache
+
+        def count_points(glyph):
+            return sum(len(contour.points) for contour in glyph.contours)
+
+        point_counts = GlyphCache(count_points)
+        point_counts.get(CurrentGlyph())
+    """
+    def __init__(self, build):
+        self._build = build
+        self._entries = {}
+        _caches.add(self)
+
+    def get(self, glyph, *args):
+        """ Returns the cached value of the glyph or builds it.
+
+        Args:
+            glyph:: RGlyph
+                The RGlyph object that you want to get value of.
+            *args:: hashable objects
+                Extra arguments of build function. Each combination of
+                arguments is cached separately.
+        """
+        naked = glyph.naked()
+        key = id(naked)
+        entry = self._entries.get(key)
+        if entry is None or entry[0]() is not naked:
+            entry = self._watch(naked)
+        values = entry[1]
+        try:
+            return values[args]
+        except KeyError:
+            value = values[args] = self._build(glyph, *args)
+            return value
+
+    def _watch(self, naked):
+        key = id(naked)
+        entry = (weakref.ref(naked, lambda _: self._entries.pop(key, None)), {})
+        self._entries[key] = entry
+        add_observer = getattr(naked, 'addObserver', None)
+        if add_observer is not None and not naked.hasObserver(self, 'Glyph.Changed'):
+            add_observer(self, '_glyph_changed', 'Glyph.Changed')
+        return entry
+
+    def _glyph_changed(self, notification):
+        self._drop(id(notification.object))
+
+    def _drop(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[1].clear()
+
+    def invalidate(self, glyph):
+        """ Drops the cached values of RGlyph object.
+
+        Args:
+            glyph:: RGlyph
+                The RGlyph object that was changed.
+        """
+        self._drop(id(glyph.naked()))
+
+    def clear(self):
+        """ Drops every cached value. """
+        for entry in self._entries.values():
+            entry[1].clear()
@@ -0,0 +1,290 @@
+""" Font tools for intersecting many lines with many segments at once.
+
+Segments are cubic or linear bezier curves given as arrays of nodes. Linear
+segments are elevated to cubic, which keeps their parameters. The distances
+of the nodes from each line form a cubic polynomial of the curve parameter,
+so every intersection is a real root of it in [0, 1].
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
+from collections import namedtuple
+import numpy as np
+
+Intersections = namedtuple('Intersections', ['lines', 'segments', 's_values', 't_values'])
+
+_EPSILON = 1e-9
+_IMAGINARY_TOLERANCE = 1e-6
+
+def points2segment(points):
+    """ Converts RPoints of a segment to nodes array.
+
+    Args:
+        points:: [RPoint, RPoint] or [RPoint, RPoint, RPoint, RPoint]
+            RPoint objects of linear or cubic segment.
+
+    Returns:
+        nodes:: numpy.ndarray (float, 2 x 2 or 4 x 2)
+            (x, y) of each node.
+    """
+    return np.array([point.position for point in points], dtype=float)
+
+def _as_cubic(segments):
+    if not isinstance(segments, np.ndarray) and len(segments) \
+            and len({len(segment) for segment in segments}) > 1:
+        return np.concatenate([_as_cubic(segment) for segment in segments])
+    segments = np.asarray(segments, dtype=float)
+    if segments.ndim == 2:
+        segments = segments[np.newaxis]
+    if segments.shape[1] == 4:
+        return segments
+    if segments.shape[1] == 2:
+        start, end = segments[:, 0], segments[:, 1]
+        return np.stack((start, start + (end-start)/3, start + 2*(end-start)/3, end), axis=1)
+    if segments.shape[1] == 3:
+        start, control, end = segments[:, 0], segments[:, 1], segments[:, 2]
+        return np.stack((start, start + 2*(control-start)/3, end + 2*(control-end)/3, end), axis=1)
+    raise ValueError(f'Segments need 2, 3 or 4 nodes, not {segments.shape[1]}.')
+
+def _power_coefficients(values):
+    """ Bernstein coefficients(..., 4) to power coefficients(..., 4), highest first. """
+    p_0, p_1, p_2, p_3 = np.moveaxis(values, -1, 0)
+    return np.stack((-p_0 + 3*p_1 - 3*p_2 + p_3,
+                     3*p_0 - 6*p_1 + 3*p_2,
+                     -3*p_0 + 3*p_1,
+                     p_0), axis=-1)
+
+def _cubic_roots(coefficients):
+    """ Returns (pair numbers, roots) of real roots of cubic polynomials.
+
+    The coefficients(N x 4, highest first) are normalized. Polynomials whose
+    leading coefficients vanish are solved as quadratic or linear ones.
+    """
+    pairs, roots = [], []
+    is_cubic = np.abs(coefficients[:, 0]) > _EPSILON
+    is_quadratic = ~is_cubic & (np.abs(coefficients[:, 1]) > _EPSILON)
+    is_linear = ~is_cubic & ~is_quadratic & (np.abs(coefficients[:, 2]) > _EPSILON)
+
+    numbers = np.flatnonzero(is_cubic)
+    if len(numbers):
+        c_3, c_2, c_1, c_0 = coefficients[numbers].T
+        companion = np.zeros((len(numbers), 3, 3))
+        companion[:, 0, 0] = -c_2 / c_3
+        companion[:, 0, 1] = -c_1 / c_3
+        companion[:, 0, 2] = -c_0 / c_3
+        companion[:, 1, 0] = companion[:, 2, 1] = 1
+        eigenvalues = np.linalg.eigvals(companion)
+        is_real = np.abs(eigenvalues.imag) <= _IMAGINARY_TOLERANCE * (1 + np.abs(eigenvalues.real))
+        rows, _ = np.nonzero(is_real)
+        pairs.append(numbers[rows])
+        roots.append(eigenvalues.real[is_real])
+
+    numbers = np.flatnonzero(is_quadratic)
+    if len(numbers):
+        _, c_2, c_1, c_0 = coefficients[numbers].T
+        discriminant = c_1*c_1 - 4*c_2*c_0
+        has_root = discriminant >= -_EPSILON
+        numbers, c_2, c_1, c_0 = numbers[has_root], c_2[has_root], c_1[has_root], c_0[has_root]
+        root = np.sqrt(np.maximum(discriminant[has_root], 0))
+        q_value = -0.5 * (c_1 + np.where(c_1 < 0, -root, root))
+        is_zero = q_value == 0
+        safe_q = np.where(is_zero, 1, q_value)
+        pairs += [numbers, numbers[~is_zero]]
+        roots += [np.where(is_zero, 0, q_value / c_2), (c_0 / safe_q)[~is_zero]]
+
+    numbers = np.flatnonzero(is_linear)
+    if len(numbers):
+        pairs.append(numbers)
+        roots.append(-coefficients[numbers, 3] / coefficients[numbers, 2])
+
+    if not pairs:
+        return np.zeros(0, dtype=int), np.zeros(0)
+    return np.concatenate(pairs), np.concatenate(roots)
+
+def _polish(coefficients, roots, iterations=2):
+    c_3, c_2, c_1, c_0 = coefficients.T
+    for _ in range(iterations):
+        value = ((c_3*roots + c_2)*roots + c_1)*roots + c_0
+        slope = (3*c_3*roots + 2*c_2)*roots + c_1
+        step = np.divide(value, slope, out=np.zeros_like(value), where=np.abs(slope) > _EPSILON)
+        roots = roots - step
+    return roots
+
+def solve_cubic(coefficients):
+    """ Finds real roots of many cubic polynomials at once.
+
+    Args:
+        coefficients:: numpy.ndarray (float, N x 4)
+            Coefficients of each polynomial, the highest degree first.
+
+    Returns:
+        polynomial numbers and roots:: (numpy.ndarray, numpy.ndarray)
+            Number of polynomial of each root and the roots. A polynomial
+            that is zero everywhere has no roots.
+    """
+    coefficients = np.asarray(coefficients, dtype=float).reshape(-1, 4)
+    scales = np.abs(coefficients).max(axis=1, keepdims=True)
+    coefficients = coefficients / np.where(scales > 0, scales, 1)
+    numbers, roots = _cubic_roots(coefficients)
+    return numbers, _polish(coefficients[numbers], roots)
+
+def evaluate(segments, s_values):
+    """ Evaluates segments at parameters.
+
+    Args:
+        segments:: numpy.ndarray (float, N x K x 2)
+            Nodes of segments. See intersect_lines().
+        s_values:: numpy.ndarray (float, N)
+            Parameter of each segment.
+
+    Returns:
+        points:: numpy.ndarray (float, N x 2)
+    """
+    segments = _as_cubic(segments)
+    s_values = np.asarray(s_values, dtype=float)[:, np.newaxis]
+    r_values = 1 - s_values
+    return r_values**3*segments[:, 0] + 3*r_values**2*s_values*segments[:, 1] \
+           + 3*r_values*s_values**2*segments[:, 2] + s_values**3*segments[:, 3]
+
+def intersect_lines(lines, segments, tolerance=1e-9):
+    """ Finds every intersection of lines and segments at once.
+
+    Collinear pairs(segment lying on the line) have no single intersection
+    and are left out. A segment touching the line gives its touching point.
+
+    Args:
+        lines:: numpy.ndarray (float, L x 2 x 2)
+            ((start x, start y), (end x, end y)) of each line.
+        segments:: numpy.ndarray (float, S x K x 2)
+            Nodes of each segment. K is 2 for linear, 3 for quadratic and
+            4 for cubic segments. A list of nodes arrays can mix them.
+        tolerance:: float (default is 1e-9)
+            Parameters that are out of [0, 1] by less than this are clipped
+            into the range.
+
+    Examples:
+        import numpy as np
+        from fwig.tools import intersecttools as it
+
+        lines = np.array([[[0, 30], [100, 30]]])
+        segments = np.array([[[10, 0], [10, 60], [90, 60], [90, 0]]])
+        result = it.intersect_lines(lines, segments)
+        result.s_values     # array([0.211..., 0.788...])
+
+    Returns:
+        intersections:: Intersections
+            lines:: numpy.ndarray (int)
+                Index of line of each intersection.
+            segments:: numpy.ndarray (int)
+                Index of segment of each intersection.
+            s_values:: numpy.ndarray (float)
+                Parameter at segment of each intersection.
+            t_values:: numpy.ndarray (float)
+                Parameter at line(0 at start, 1 at end) of each intersection.
+            Intersections are sorted by line, segment and s_values.
+    """
+    lines = np.asarray(lines, dtype=float).reshape(-1, 2, 2)
+    segments = _as_cubic(segments)
+    starts, directions = lines[:, 0], lines[:, 1] - lines[:, 0]
+    normals = np.stack((-directions[:, 1], directions[:, 0]), axis=1)
+
+    # Signed distances(scaled) of nodes from each line. (L x S x 4)
+    distances = np.einsum('lskc,lc->lsk',
+                          segments[np.newaxis] - starts[:, np.newaxis, np.newaxis], normals)
+    line_numbers, segment_numbers = np.nonzero(_may_meet(distances))
+    return _solve(lines, segments, distances[line_numbers, segment_numbers],
+                  line_numbers, segment_numbers, tolerance)
+
+def intersect_pairs(lines, segments, tolerance=1e-9):
+    """ Finds intersections of each line with its own segment.
+
+    Unlike intersect_lines(), line i is intersected only with segment i, so
+    the work is linear to the number of pairs.
+
+    Args:
+        lines:: numpy.ndarray (float, N x 2 x 2)
+            See intersect_lines().
+        segments:: numpy.ndarray (float, N x K x 2)
+            See intersect_lines().
+        tolerance:: float (default is 1e-9)
+            See intersect_lines().
+
+    Returns:
+        intersections:: Intersections
+            lines and segments are both the number of pair of each
+            intersection. See intersect_lines().
+    """
+    lines = np.asarray(lines, dtype=float).reshape(-1, 2, 2)
+    segments = _as_cubic(segments)
+    starts, directions = lines[:, 0], lines[:, 1] - lines[:, 0]
+    normals = np.stack((-directions[:, 1], directions[:, 0]), axis=1)
+
+    # Signed distances(scaled) of nodes from the line of each pair. (N x 4)
+    distances = np.einsum('nkc,nc->nk', segments - starts[:, np.newaxis], normals)
+    numbers = np.flatnonzero(_may_meet(distances))
+    return _solve(lines, segments, distances[numbers], numbers, numbers, tolerance)
+
+def _may_meet(distances):
+    # Curves lie in the convex hull of nodes, so nodes on one side can not meet.
+    return (np.abs(distances).max(axis=-1) > 0) & (distances.min(axis=-1) <= 0) \
+           & (distances.max(axis=-1) >= 0)
+
+def _solve(lines, segments, distances, line_numbers, segment_numbers, tolerance):
+    """ Intersections of pairs whose node distances(N x 4) from the line are given. """
+    starts, directions = lines[:, 0], lines[:, 1] - lines[:, 0]
+    scales = np.abs(distances).max(axis=1, keepdims=True)
+    coefficients = _power_coefficients(distances / scales)
+
+    pairs, roots = _cubic_roots(coefficients)
+    is_inside = (roots >= -1e-6) & (roots <= 1 + 1e-6)
+    pairs, roots = pairs[is_inside], roots[is_inside]
+    roots = _polish(coefficients[pairs], roots)
+    is_inside = (roots >= -tolerance) & (roots <= 1 + tolerance)
+    pairs, s_values = pairs[is_inside], np.clip(roots[is_inside], 0, 1)
+    line_numbers, segment_numbers = line_numbers[pairs], segment_numbers[pairs]
+
+    points = evaluate(segments[segment_numbers], s_values)
+    lengths = np.einsum('nc,nc->n', directions[line_numbers], directions[line_numbers])
+    t_values = np.einsum('nc,nc->n', points - starts[line_numbers], directions[line_numbers]) \
+               / np.where(lengths > 0, lengths, 1)
+    is_inside = (t_values >= -tolerance) & (t_values <= 1 + tolerance) & (lengths > 0)
+    line_numbers, segment_numbers = line_numbers[is_inside], segment_numbers[is_inside]
+    s_values, t_values = s_values[is_inside], np.clip(t_values[is_inside], 0, 1)
+
+    # Sorts, and removes the same root found twice(touching point).
+    order = np.lexsort((s_values, segment_numbers, line_numbers))
+    line_numbers, segment_numbers = line_numbers[order], segment_numbers[order]
+    s_values, t_values = s_values[order], t_values[order]
+    is_new = np.ones(len(s_values), dtype=bool)
+    is_new[1:] = (line_numbers[1:] != line_numbers[:-1]) \
+                 | (segment_numbers[1:] != segment_numbers[:-1]) \
+                 | (np.diff(s_values) > 1e-7)
+    return Intersections(line_numbers[is_new], segment_numbers[is_new],
+                         s_values[is_new], t_values[is_new])
+
+def first_intersections(lines, segments, tolerance=1e-9):
+    """ Finds the intersection with the smallest s_value of each pair.
+
+    Args:
+        lines:: numpy.ndarray (float, L x 2 x 2)
+            See intersect_lines().
+        segments:: numpy.ndarray (float, S x K x 2)
+            See intersect_lines().
+        tolerance:: float (default is 1e-9)
+            See intersect_lines().
+
+    Returns:
+        s_values:: numpy.ndarray (float, L x S)
+            Parameter at segment of the first intersection of each line and
+            segment, NaN if they do not meet.
+    """
+    lines = np.asarray(lines, dtype=float).reshape(-1, 2, 2)
+    segment_count = len(_as_cubic(segments))
+    result = intersect_lines(lines, segments, tolerance)
+    s_values = np.full((len(lines), segment_count), np.nan)
+    # Intersections are sorted by s_values, so the first one of a pair is kept.
+    is_first = np.ones(len(result.s_values), dtype=bool)
+    is_first[1:] = (np.diff(result.lines) != 0) | (np.diff(result.segments) != 0)
+    s_values[result.lines[is_first], result.segments[is_first]] = result.s_values[is_first]
+    return s_values
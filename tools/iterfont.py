@@ -3,11 +3,15 @@
 Calls functions with RFont object's children. RFont object's child is one of the
 RGlyph, RContour and RPoint. This module helps you to iterate RFont object easily.
 
-Last modified date: 2019/09/26
+Last modified date: 2026/10/18
 
 Created by Seongju Woo.
 """
+import os
+import re
+import fnmatch
 from functools import wraps
+from concurrent.futures import ProcessPoolExecutor
 
 def iter_with_func(iter_func):
     """ Decorator for iterating over font objects with functions.
@@ -16,6 +20,17 @@ def iter_with_func(iter_func):
     be used with conditions. This conditions must be a predicate(functions
     that returns True or False).
 
+    Conditions marked by name_only() or made by name_matches() are checked
+    against glyph names before glyphs are loaded, so rejected glyphs are
+    never loaded from the font.
+
+    The decorated generator takes a keyword argument jobs(default is 1).
+    If jobs is not 1, glyphs are spread over that many worker processes
+    (every CPU if None). Each worker gets the current outlines of its glyphs
+    and opens the rest of the font from font.path for reference. Functions
+    and conditions must be picklable(defined at module level). Changed
+    glyphs are merged back into the font in the order of font.keys().
+
     Examples:
         from fontParts.world import CurrentFont
 
@@ -33,20 +48,178 @@ def iter_with_func(iter_func):
             return (font.getGlyph(key) for key in font.keys())
 
         generate_glyph(CurrentFont(), print_glyph, print_glyph=print_condition)
+
+        # Same as above with 4 processes.
+        generate_glyph(CurrentFont(), print_glyph, print_glyph=print_condition, jobs=4)
     """
     @wraps(iter_func)
-    def call_func_with_cond(data, *args, **kwargs):
-        objects = iter_func(data, *args, **kwargs)
-        for object_ in objects:
-            for function in args:
-                condition = kwargs.get(function.__name__)
-                if condition is None:
-                    function(object_)
-                else:
-                    if condition(object_):
-                        function(object_)
+    def call_func_with_cond(data, *args, jobs=1, **kwargs):
+        if any(getattr(kwargs.get(function.__name__), 'name_only', False) \
+               for function in args):
+            data = _FontView(data, _filter_keys(data, args, kwargs))
+        if jobs == 1:
+            _call_functions(iter_func(data, *args, **kwargs), args, kwargs)
+        else:
+            _call_in_processes(call_func_with_cond, data, args, kwargs, jobs)
     return call_func_with_cond
 
+def _call_functions(objects, functions, conditions):
+    for object_ in objects:
+        for function in functions:
+            condition = conditions.get(function.__name__)
+            if condition is None:
+                function(object_)
+            elif getattr(condition, 'name_only', False):
+                if condition(_GlyphName(_glyph_name_of(object_))):
+                    function(object_)
+            else:
+                if condition(object_):
+                    function(object_)
+
+def _glyph_name_of(object_):
+    glyph = getattr(object_, 'glyph', None)
+    if glyph is None:
+        return object_.name
+    return glyph.name
+
+def _filter_keys(font, functions, conditions):
+    name_conditions = []
+    for function in functions:
+        condition = conditions.get(function.__name__)
+        if not getattr(condition, 'name_only', False):
+            # This function needs every glyph.
+            return list(font.keys())
+        name_conditions.append(condition)
+    return [key for key in font.keys() \
+                if any(condition(_GlyphName(key)) for condition in name_conditions)]
+
+
+class _GlyphName:
+    """ Stands for a glyph in conditions that only look at glyph.name. """
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+
+def name_only(condition):
+    """ Marks a condition that only looks at glyph.name.
+
+    Glyphs rejected by name-only conditions are never loaded from the font.
+    The condition is called with an object that has only the name attribute
+    of the glyph. In contour_generator and point_generator, it is the name of
+    the glyph that contains the contour or point.
+
+    Args:
+        condition:: function
+            The predicate that you want to mark.
+
+    Examples:
+        from fontParts.world import CurrentFont
+
+        @name_only
+        def not_composite(glyph):
+            return not glyph.name.startswith('uni')
+
+        glyph_generator(CurrentFont(), print_func, print_func=not_composite)
+    """
+    condition.name_only = True
+    return condition
+
+
+def name_matches(pattern, invert=False):
+    """ Returns a name-only condition that matches glyph names with a pattern.
+
+    Args:
+        pattern:: str or re.Pattern
+            A glob pattern(for example, 'uni*') or a compiled regular expression.
+        invert:: bool (default is False)
+            If this is True, matches glyph names that do not match the pattern.
+
+    Examples:
+        from fontParts.world import CurrentFont
+
+        # For every glyph except 'uni*' composite glyphs.
+        glyph_generator(CurrentFont(), print_func,
+                        print_func=name_matches('uni*', invert=True))
+    """
+    if isinstance(pattern, str):
+        pattern = re.compile(fnmatch.translate(pattern))
+    return _NamePattern(pattern, invert)
+
+
+class _NamePattern:
+    """ A picklable name-only condition made by name_matches(). """
+    name_only = True
+
+    def __init__(self, pattern, invert):
+        self.pattern = pattern
+        self.invert = invert
+
+    def __call__(self, glyph):
+        return (self.pattern.match(glyph.name) is None) == self.invert
+
+
+class _FontView:
+    """ Shows only some glyphs of RFont object to the generators. """
+    def __init__(self, font, keys):
+        self._font = font
+        self._keys = keys
+
+    def keys(self):
+        return list(self._keys)
+
+    def __getattr__(self, name):
+        return getattr(self._font, name)
+
+
+_worker_fonts = {}
+
+def _open_worker_font(font_path):
+    font = _worker_fonts.get(font_path)
+    if font is None:
+        from fontParts.world import OpenFont, NewFont
+        if font_path is None:
+            font = NewFont(showInterface=False)
+        else:
+            font = OpenFont(font_path, showInterface=False)
+        _worker_fonts[font_path] = font
+    return font
+
+def _run_in_process(generator, font_path, glifs, functions, conditions):
+    font = _open_worker_font(font_path)
+    for key, glif in glifs:
+        glyph = font.getGlyph(key) if key in font else font.newGlyph(key)
+        glyph.clear()
+        glyph.loadFromGLIF(glif)
+    keys = [key for key, _ in glifs]
+    objects = generator.__wrapped__(_FontView(font, keys), *functions, **conditions)
+    _call_functions(objects, functions, conditions)
+    changes = []
+    for key, before in glifs:
+        after = font.getGlyph(key).dumpToGLIF()
+        if after != before:
+            changes.append((key, after))
+    return changes
+
+def _call_in_processes(generator, font, functions, conditions, jobs):
+    jobs = jobs or os.cpu_count()
+    keys = list(font.keys())
+    chunk_size = max(1, -(-len(keys) // (4*jobs)))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = []
+        for i in range(0, len(keys), chunk_size):
+            glifs = [(key, font.getGlyph(key).dumpToGLIF()) for key in keys[i:i+chunk_size]]
+            futures.append(executor.submit(_run_in_process, generator, font.path, glifs,
+                                           functions, conditions))
+        # Merges in the order of font.keys() whatever process finished first.
+        for future in futures:
+            for key, glif in future.result():
+                glyph = font.getGlyph(key)
+                glyph.clear()
+                glyph.loadFromGLIF(glif)
+                glyph.changed()
+
 @iter_with_func
 def point_generator(font, *functions, **conditions):
     """ Calls functions with RPoint objects in RFont object.
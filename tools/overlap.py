@@ -1,39 +1,286 @@
 """ This is for finding contours that overlap with others.
 
-Last modified date: 2019/09/09
+Contours overlap when one contour has two or more points on the positions of
+another contour's points. Positions are hashed, so each glyph is checked in
+time linear to its points, and glyphs of a font can be checked by many
+processes.
+
+Contours also overlap when their outlines cross. Crossings are found by a
+sweep over the boxes of segments in x, which keeps the segments whose x
+ranges hold the sweep line ordered by y. Only pairs of segments whose boxes
+overlap are solved exactly, lines with intersecttools and pairs of curves
+with bezier.
+
+Last modified date: 2026/10/18
 
 Created by Seongju Woo.
 """
+import os
+import heapq
+import bisect
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import bezier
 from fontParts.world import CurrentFont
+from fwig.tools import beziertools as bt, intersecttools as it
+
+Crossing = namedtuple('Crossing', ['contour_1', 'segment_1', 'contour_2', 'segment_2', 'position'])
+
+_DEGREES = {'line': 1, 'curve': 3}
+
+def _contour_positions(contour):
+    return [(point.x, point.y) for point in contour.naked()]
+
+def overlap_contour_indexes(contour_positions):
+    """ Finds contours that overlap with others from their point positions.
+
+    Contour t overlaps if another contour c has two or more points(counted
+    with repeats) on the positions of t's points.
+
+    Args:
+        contour_positions:: [[(x, y), ...], ...]
+            Positions of points of each contour.
+
+    Returns:
+        indexes:: [int, int, ...]
+            Sorted indexes of overlapping contours.
+    """
+    # Position -> {contour index: number of points at the position}
+    position_counts = defaultdict(Counter)
+    for index, positions in enumerate(contour_positions):
+        for position in positions:
+            position_counts[position][index] += 1
+
+    # (c, t) -> number of points of c on the positions of t.
+    pair_counts = Counter()
+    for counts in position_counts.values():
+        if len(counts) < 2:
+            continue
+        for other, count in counts.items():
+            for target in counts:
+                if target != other:
+                    pair_counts[other, target] += count
+    return sorted({target for (_, target), count in pair_counts.items() if count > 1})
 
 def _is_overlap_other_contour(contours, target_contour):
+    target_positions = set(_contour_positions(target_contour))
     for contour in contours:
         if contour == target_contour:
             continue
         overlap_count = 0
-        points = contour.points
-        target_points = target_contour.points
-        position_list = [point.position for point in target_points]
-        for point in points:
-            if point.position in position_list:
+        for position in _contour_positions(contour):
+            if position in target_positions:
                 overlap_count += 1
             if overlap_count > 1:
                 return True
     return False
 
-def find_overlap_contour_current_font():
+def _chunk(function, glyph_data):
+    return [(name, function(data)) for name, data in glyph_data]
+
+def _map_glyphs(function, glyph_data, jobs):
+    """ Returns [(name, function(data)), ...] of [(name, data), ...]. """
+    if jobs == 1:
+        return _chunk(function, glyph_data)
+    jobs = jobs or os.cpu_count()
+    chunk_size = max(1, -(-len(glyph_data) // (4*jobs)))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_chunk, function, glyph_data[i:i+chunk_size])
+                   for i in range(0, len(glyph_data), chunk_size)]
+        return [result for future in futures for result in future.result()]
+
+def _contour_sets(font, results):
+    contour_set = set()
+    for name, indexes in results:
+        if indexes:
+            contours = font[name].contours
+            contour_set.update((contours[index], index) for index in indexes)
+    return contour_set
+
+def find_overlap_contour(font, jobs=1):
+    """ Finds overlapping contours in the font.
+
+    Args:
+        font:: RFont
+            The RFont object to search.
+        jobs:: int (default is 1)
+            The number of processes. If it is None, uses every CPU. Only
+            point positions are sent to the processes.
+
+    Returns:
+        overlap_set:: set
+            A set of (RContour, index) of overlapping contours.
+    """
+    glyph_positions = [(name, [_contour_positions(contour) for contour in font[name].contours])
+                       for name in font.glyphOrder if name in font]
+    return _contour_sets(font, _map_glyphs(overlap_contour_indexes, glyph_positions, jobs))
+
+def find_overlap_contour_current_font(jobs=1):
     """ Finds overlapping contours in the current font.
 
+    Args:
+        jobs:: int (default is 1)
+            The number of processes. If it is None, uses every CPU.
+
     Returns:
         overlap_set:: set
             A set of overlapping RContour objects in the current font.
     """
-    font = CurrentFont()
-    overlap_set = set()
-    for o in font.glyphOrder:
-        glyph = font.getGlyph(o)
-        for contour in glyph.contours:
-            if _is_overlap_other_contour(glyph.contours, contour):
-                overlap_set.add((contour, contour.index))
+    return find_overlap_contour(CurrentFont(), jobs)
+
+def _contour_segments(contour):
+    """ Nodes(K x 2) of each line and curve of the contour, in the order of
+    beziertools.get_segments().
+    """
+    points = [(point.x, point.y, point.segmentType) for point in contour.naked()]
+    coordinates = np.array([point[:2] for point in points], dtype=float).reshape(-1, 2)
+    segments = []
+    for idx, point in enumerate(points):
+        degree = _DEGREES.get(point[2])
+        if degree is not None:
+            segments.append(coordinates[[(idx+i) % len(points) for i in range(-degree, 1)]])
+    return segments
+
+def _candidate_pairs(boxes, contour_numbers):
+    """ Pairs of segments of different contours whose boxes overlap.
+
+    Boxes enter the sweep at their min x and leave after their max x. The
+    active boxes are kept sorted by min y, so a new box is checked only
+    against the active boxes that start below its max y.
+    """
+    pairs = []
+    leaving = []            # Heap of (max x, number) of active boxes.
+    active = []             # Sorted (min y, number) of active boxes.
+    for number in sorted(range(len(boxes)), key=lambda number: boxes[number][0]):
+        min_x, min_y, _, max_y = boxes[number]
+        while leaving and leaving[0][0] < min_x:
+            _, old = heapq.heappop(leaving)
+            del active[bisect.bisect_left(active, (boxes[old][1], old))]
+        for _, other in active[:bisect.bisect_right(active, (max_y, len(boxes)))]:
+            if boxes[other][3] >= min_y and contour_numbers[other] != contour_numbers[number]:
+                pairs.append((min(number, other), max(number, other)))
+        heapq.heappush(leaving, (boxes[number][2], number))
+        bisect.insort(active, (min_y, number))
+    return sorted(pairs)
+
+def _curve_crossings(nodes_1, nodes_2):
+    """ Parameters(s, t) where two cubic segments cross. """
+    curve_1 = bezier.Curve(np.asfortranarray(nodes_1.T), degree=3)
+    curve_2 = bezier.Curve(np.asfortranarray(nodes_2.T), degree=3)
+    try:
+        return curve_1.intersect(curve_2).T.tolist()
+    except (NotImplementedError, ValueError):
+        # Coincident or tangent curves have no single crossing.
+        return []
+
+def segment_crossings(contour_segments):
+    """ Finds every crossing of segments of different contours.
+
+    Args:
+        contour_segments:: [[numpy.ndarray, ...], ...]
+            Nodes(K x 2, K is 2 for line and 4 for curve) of each segment of
+            each contour.
+
+    Returns:
+        crossings:: [Crossing, Crossing, ...]
+            contour_1, segment_1:: int
+                Index of contour, and number(at its segments) of segment.
+            contour_2, segment_2:: int
+                The same for the other segment. contour_1 < contour_2.
+            position:: (float, float)
+                Position of the crossing.
+            A pair of segments touching or collinear at a point gives it.
+            Coincident pairs of curves are left out.
+    """
+    segments, keys = [], []
+    for contour_index, nodes_list in enumerate(contour_segments):
+        for segment_index, nodes in enumerate(nodes_list):
+            segments.append(np.asarray(nodes, dtype=float))
+            keys.append((contour_index, segment_index))
+    boxes = [(*nodes.min(axis=0).tolist(), *nodes.max(axis=0).tolist()) for nodes in segments]
+    pairs = _candidate_pairs(boxes, [key[0] for key in keys])
+
+    # Pairs with a line are solved at once, the line as the ray.
+    found = []
+    line_pairs = [(number_1, number_2) if len(segments[number_1]) == 2 else (number_2, number_1)
+                  for number_1, number_2 in pairs
+                  if len(segments[number_1]) == 2 or len(segments[number_2]) == 2]
+    if line_pairs:
+        result = it.intersect_pairs([segments[line] for line, _ in line_pairs],
+                                    [segments[other] for _, other in line_pairs])
+        positions = it.evaluate([segments[line_pairs[pair][1]] for pair in result.segments],
+                                result.s_values)
+        for pair, position in zip(result.segments.tolist(), positions.tolist()):
+            found.append((*line_pairs[pair], tuple(position)))
+    for number_1, number_2 in pairs:
+        if len(segments[number_1]) == 4 and len(segments[number_2]) == 4:
+            for s_value, _ in _curve_crossings(segments[number_1], segments[number_2]):
+                position = it.evaluate(segments[number_1], [s_value])[0]
+                found.append((number_1, number_2, tuple(position.tolist())))
+
+    crossings = []
+    for number_1, number_2, position in found:
+        (contour_1, segment_1), (contour_2, segment_2) = sorted((keys[number_1], keys[number_2]))
+        crossings.append(Crossing(contour_1, segment_1, contour_2, segment_2, position))
+    return sorted(crossings)
+
+def find_crossings(glyph):
+    """ Finds every crossing of outlines of different contours in the glyph.
+
+    This is a fast replacement for glyph.hasOverlap(). Segment numbers are
+    indexes at beziertools.get_segments() of the contour.
+
+    Args:
+        glyph:: RGlyph
+            The RGlyph object to search.
+
+    Examples:
+        from fontParts.world import CurrentGlyph
+        from fwig.tools import overlap
+
+        for crossing in overlap.find_crossings(CurrentGlyph()):
+            print(crossing.contour_1, crossing.contour_2, crossing.position)
 
-    return overlap_set
+    Returns:
+        crossings:: [Crossing, Crossing, ...]
+            See segment_crossings().
+    """
+    return segment_crossings([[segment.nodes.T for segment in bt.get_segments(contour)]
+                              for contour in glyph.contours])
+
+def crossing_contour_indexes(contour_segments):
+    """ Sorted indexes of contours that cross others. See segment_crossings(). """
+    return sorted({index for crossing in segment_crossings(contour_segments)
+                   for index in (crossing.contour_1, crossing.contour_2)})
+
+def find_crossing_contour(font, jobs=1):
+    """ Finds contours whose outlines cross other contours in the font.
+
+    Args:
+        font:: RFont
+            The RFont object to search.
+        jobs:: int (default is 1)
+            The number of processes. If it is None, uses every CPU. Only
+            nodes of segments are sent to the processes.
+
+    Returns:
+        crossing_set:: set
+            A set of (RContour, index) of crossing contours.
+    """
+    glyph_segments = [(name, [_contour_segments(contour) for contour in font[name].contours])
+                      for name in font.glyphOrder if name in font]
+    return _contour_sets(font, _map_glyphs(crossing_contour_indexes, glyph_segments, jobs))
+
+def find_crossing_contour_current_font(jobs=1):
+    """ Finds contours whose outlines cross other contours in the current font.
+
+    Args:
+        jobs:: int (default is 1)
+            The number of processes. If it is None, uses every CPU.
+
+    Returns:
+        crossing_set:: set
+            A set of (RContour, index) of crossing contours.
+    """
+    return find_crossing_contour(CurrentFont(), jobs)
@@ -1,9 +1,59 @@
-from xml.etree import ElementTree as et
+""" Font tools for plotting glyphs.
+
+plot_rglyph() and plot_glif() show a glyph with pyplot. Proof sheets are
+drawn headless with the Agg canvas. The outline of a whole page is a single
+path of native lines and cubic curves, and pages can be rendered by many
+processes.
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from matplotlib import pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
 import seaborn as sns
 sns.set()
 import bezier
+from fwig.tools import attributetools as at, beziertools as bt, glif
+from fwig.tools.fontsnapshot import FontSnapshot
+
+ProofGlyph = namedtuple('ProofGlyph', ['name', 'width', 'vertices', 'codes', 'labels'])
+
+OVERLAYS = ('penPair', 'stroke', 'depend')
+
+_OFFCURVE, _MOVE = glif.TYPE_CODES['offcurve'], glif.TYPE_CODES['move']
+# Path code of each point type. Off-curve points take the code of the next
+# on-curve point.
+_PATH_CODES = np.array([Path.CURVE4, Path.MOVETO, Path.LINETO, Path.CURVE4, Path.CURVE3],
+                       dtype=Path.code_type)
+_OVERLAY_COLORS = {'penPair': 'pale red', 'stroke': 'medium green', 'depend': 'orange'}
+
+def _plot_points(subplot, nodes):
+    if nodes.shape[1] == 4:
+        subplot.plot(nodes[0, :2], nodes[1, :2], color=sns.xkcd_rgb['medium green'])
+        subplot.plot(nodes[0, 2:], nodes[1, 2:], color=sns.xkcd_rgb['medium green'])
+    subplot.plot(nodes[0, 0], nodes[1, 0], marker='s', linestyle='None', \
+                 color=sns.xkcd_rgb['pale red'])
+    if nodes.shape[1] == 4:
+        subplot.plot(nodes[0, 1:-1], nodes[1, 1:-1], marker='.', linestyle='None', \
+                     color=sns.xkcd_rgb['pale red'])
+
+def _plot_line_nodes(subplot, nodes, show_points):
+    subplot.plot(nodes[0, :], nodes[1, :], color=sns.xkcd_rgb['denim blue'])
+    if show_points:
+        _plot_points(subplot, nodes)
+
+def _plot_curve_nodes(subplot, nodes, show_points):
+    _ = bezier.Curve(nodes, degree=3).plot(100, ax=subplot, color=sns.xkcd_rgb['denim blue']) # TODO: width
+    if show_points:
+        _plot_points(subplot, nodes)
 
 def plot_line(subplot, line_points, show_points):
     """ Plotting lines.
@@ -16,10 +66,7 @@ def plot_line(subplot, line_points, show_points):
     nodes = np.asfortranarray([
         [float(p.x) for p in line_points],
         [float(p.y) for p in line_points]])
-    subplot.plot(nodes[0, :], nodes[1, :], color=sns.xkcd_rgb['denim blue'])
-    if show_points:
-        subplot.plot(nodes[0, 0], nodes[1, 0], marker='s', linestyle='None', \
-                     color=sns.xkcd_rgb['pale red'])
+    _plot_line_nodes(subplot, nodes, show_points)
 
 def plot_curve(subplot, curve_points, show_points):
     """ Plotting bezier curves.
@@ -32,15 +79,288 @@ def plot_curve(subplot, curve_points, show_points):
     nodes = np.asfortranarray([
         [float(p.x) for p in curve_points],
         [float(p.y) for p in curve_points]])
-    if show_points:
-        subplot.plot(nodes[0, :2], nodes[1, :2], color=sns.xkcd_rgb['medium green'])
-        subplot.plot(nodes[0, 2:], nodes[1, 2:], color=sns.xkcd_rgb['medium green'])
-    _ = bezier.Curve(nodes, degree=3).plot(100, ax=subplot, color=sns.xkcd_rgb['denim blue']) # TODO: width
-    if show_points:
-        subplot.plot(nodes[0, 0], nodes[1, 0], marker='s', linestyle='None', \
-                     color=sns.xkcd_rgb['pale red'])
-        subplot.plot(nodes[0, 1:-1], nodes[1, 1:-1], marker='.', linestyle='None', \
-                     color=sns.xkcd_rgb['pale red'])
+    _plot_curve_nodes(subplot, nodes, show_points)
+
+def outline_path(coordinates, types, contour_lengths):
+    """ Converts points of contours to the vertices and codes of a matplotlib Path.
+
+    Curves are kept as cubic(or quadratic with one off-curve point) bezier
+    curves of the path, so they are not sampled.
+
+    Args:
+        coordinates:: numpy.ndarray (float, N x 2)
+            x and y of every point of the contours in order.
+        types:: numpy.ndarray (int, N)
+            Point types as indexes of glif.POINT_TYPES.
+        contour_lengths:: [int, int, ...]
+            Number of points of each contour.
+
+    Returns:
+        vertices and codes:: (numpy.ndarray, numpy.ndarray)
+            (float, M x 2) and (uint8, M) of the path.
+    """
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    types = np.asarray(types)
+    all_vertices, all_codes = [], []
+    offset = 0
+    for length in contour_lengths:
+        contour_types = types[offset:offset+length]
+        on_curves = np.flatnonzero(contour_types != _OFFCURVE)
+        if len(on_curves):
+            is_open = contour_types[0] == _MOVE
+            # Closed contours start at their first on-curve point, and come
+            # back to it before closing.
+            order = np.arange(length + (not is_open)) + (0 if is_open else on_curves[0])
+            order %= length
+            ordered_types = contour_types[order]
+            next_on_curves = np.flatnonzero(ordered_types != _OFFCURVE)
+            next_types = ordered_types[next_on_curves[np.minimum(
+                np.searchsorted(next_on_curves, np.arange(len(order))), len(next_on_curves) - 1)]]
+            codes = _PATH_CODES[np.where(ordered_types == _OFFCURVE, next_types, ordered_types)]
+            codes[0] = Path.MOVETO
+            vertices = coordinates[offset:offset+length][order]
+            if not is_open:
+                vertices = np.concatenate((vertices, vertices[:1]))
+                codes = np.concatenate((codes, [Path.CLOSEPOLY]))
+            all_vertices.append(vertices)
+            all_codes.append(codes)
+        offset += length
+    if not all_vertices:
+        return np.zeros((0, 2)), np.zeros(0, dtype=Path.code_type)
+    return np.concatenate(all_vertices), np.concatenate(all_codes).astype(Path.code_type)
+
+def _rglyph_points(rglyph):
+    coordinates, types, lengths, names = [], [], [], []
+    for contour in rglyph.contours:
+        points = [(point.x, point.y, point.segmentType, point.name) for point in contour.naked()]
+        coordinates += [point[:2] for point in points]
+        types += [glif.TYPE_CODES[point[2]] for point in points]
+        names += [point[3] for point in points]
+        lengths.append(len(points))
+    return np.array(coordinates, dtype=float).reshape(-1, 2), np.array(types, dtype=int), \
+           lengths, names
+
+def _labels(coordinates, names, overlays):
+    """ {key: [(x, y, value), ...]} of points that have each overlay attribute. """
+    labels = {key: [] for key in overlays}
+    if not overlays:
+        return labels
+    for (x, y), name in zip(coordinates.tolist(), names):
+        if name is None:
+            continue
+        attributes = at.name2dict(name)
+        for key in overlays:
+            if key in attributes:
+                labels[key].append((x, y, attributes[key]))
+    return labels
+
+def proof_glyph(rglyph, overlays=()):
+    """ Makes a ProofGlyph of RGlyph object for render_sheet().
+
+    Args:
+        rglyph:: RGlyph
+            The RGlyph object.
+        overlays:: (str, str, ...) (default is ())
+            Keys of point attributes to label. For example, OVERLAYS.
+
+    Returns:
+        proof glyph:: ProofGlyph
+            name, width, vertices and codes of the outline path, and labels
+            {key: [(x, y, value), ...]} of overlays.
+    """
+    coordinates, types, lengths, names = _rglyph_points(rglyph)
+    vertices, codes = outline_path(coordinates, types, lengths)
+    return ProofGlyph(rglyph.name, float(rglyph.width), vertices, codes,
+                      _labels(coordinates, names, overlays))
+
+def snapshot_proof_glyph(snapshot, glyph, overlays=()):
+    """ Makes a ProofGlyph of a glyph of FontSnapshot for render_sheet().
+
+    Args:
+        snapshot:: FontSnapshot
+            The snapshot of UFO format font data.
+        glyph:: int
+            The index of glyph.
+        overlays:: (str, str, ...) (default is ())
+            See proof_glyph().
+
+    Returns:
+        proof glyph:: ProofGlyph
+    """
+    points = snapshot.glyph_points(glyph)
+    contour_offsets = snapshot.contour_offsets[snapshot.glyph_contour_offsets[glyph]:
+                                               snapshot.glyph_contour_offsets[glyph+1] + 1]
+    coordinates = np.asarray(snapshot.coordinates[points], dtype=float)
+    vertices, codes = outline_path(coordinates, snapshot.types[points], np.diff(contour_offsets))
+    return ProofGlyph(snapshot.glyph_names[glyph], float(snapshot.widths[glyph]), vertices, codes,
+                      _labels(coordinates, snapshot.names[points].tolist(), overlays))
+
+def _control_points(codes):
+    """ Whether each vertex of a path is a control point of a curve. """
+    is_control = np.zeros(len(codes), dtype=bool)
+    # A cubic curve is three CURVE4 vertices and a quadratic one is two CURVE3
+    # vertices, the end point last.
+    for code, size in ((Path.CURVE4, 3), (Path.CURVE3, 2)):
+        is_code = codes == code
+        positions = np.flatnonzero(is_code)
+        starts = np.flatnonzero(is_code & ~np.concatenate(([False], is_code[:-1])))
+        run_starts = starts[np.searchsorted(starts, positions, side='right') - 1]
+        is_control[positions] = (positions - run_starts) % size != size - 1
+    return is_control
+
+def render_sheet(proof_glyphs, file_path, columns=12, cell_size=1.0, dpi=100,
+                 y_range=(-200, 1000), show_points=False):
+    """ Renders glyphs in a grid to a PNG proof sheet without any display.
+
+    Outlines of every glyph of the sheet are drawn as one path.
+
+    Args:
+        proof_glyphs:: [ProofGlyph, ProofGlyph, ...]
+            Glyphs to render(see proof_glyph()), in the order of rows.
+        file_path:: str
+            A path of the PNG file to write.
+        columns:: int (default is 12)
+            Number of glyphs in a row.
+        cell_size:: float (default is 1.0)
+            Size(inch) of a cell of the grid.
+        dpi:: int (default is 100)
+            Dots per inch of the image.
+        y_range:: (float, float) (default is (-200, 1000))
+            Range of y in font units shown in a cell. The cell is as wide
+            as it is high, and glyphs are centered by their advance width.
+        show_points:: bool (default is False)
+            If this is True, marks on-curve and off-curve points.
+    """
+    columns = max(1, min(columns, len(proof_glyphs)))
+    rows = max(1, -(-len(proof_glyphs) // columns))
+    size = float(y_range[1] - y_range[0])
+    figure = Figure(figsize=(columns*cell_size, rows*cell_size), dpi=dpi)
+    FigureCanvasAgg(figure)
+    axes = figure.add_axes((0, 0, 1, 1))
+    axes.set_axis_off()
+    axes.set_xlim(0, columns*size)
+    axes.set_ylim(-rows*size, 0)
+    axes.set_aspect('equal')
+
+    all_vertices, all_codes, labels = [], [], {}
+    font_size = max(4., 6. * cell_size)
+    for number, glyph in enumerate(proof_glyphs):
+        row, column = divmod(number, columns)
+        shift = np.array([column*size + (size - glyph.width) / 2, -(row+1)*size - y_range[0]])
+        all_vertices.append(glyph.vertices + shift)
+        all_codes.append(glyph.codes)
+        for key, key_labels in glyph.labels.items():
+            labels.setdefault(key, []).extend((x + shift[0], y + shift[1], value)
+                                              for x, y, value in key_labels)
+        axes.text(column*size + size*0.03, -(row+1)*size + size*0.03, glyph.name,
+                  fontsize=font_size, color=sns.xkcd_rgb['grey'])
+    vertices = np.concatenate(all_vertices) if all_vertices else np.zeros((0, 2))
+    codes = np.concatenate(all_codes) if all_codes else np.zeros(0, dtype=Path.code_type)
+    if len(codes):
+        # add_artist() does not walk the curves for data limits like add_patch().
+        axes.add_artist(PathPatch(Path(vertices, codes), facecolor='black', edgecolor='none'))
+
+    if show_points and len(codes):
+        is_point = codes != Path.CLOSEPOLY
+        is_off_curve = _control_points(codes)
+        axes.plot(*vertices[is_point & ~is_off_curve].T, marker='s', markersize=1.5,
+                  linestyle='None', color=sns.xkcd_rgb['pale red'])
+        axes.plot(*vertices[is_off_curve].T, marker='.', markersize=1.5,
+                  linestyle='None', color=sns.xkcd_rgb['medium green'])
+
+    for key, key_labels in labels.items():
+        if not key_labels:
+            continue
+        color = sns.xkcd_rgb[_OVERLAY_COLORS.get(key, 'purple')]
+        x_values, y_values, values = zip(*key_labels)
+        axes.plot(x_values, y_values, marker='o', markersize=2, linestyle='None', color=color)
+        for x, y, value in key_labels:
+            axes.text(x, y, str(value), fontsize=font_size*0.6, color=color)
+    figure.savefig(file_path, dpi=dpi, facecolor='white')
+
+_worker_snapshots = {}
+
+def _open_worker_snapshot(path):
+    snapshot = _worker_snapshots.get(path)
+    if snapshot is None:
+        snapshot = _worker_snapshots[path] = FontSnapshot(path, cache=True)
+    return snapshot
+
+def _render_snapshot_page(path, glyphs, file_path, overlays, options):
+    snapshot = _open_worker_snapshot(path)
+    render_sheet([snapshot_proof_glyph(snapshot, glyph, overlays) for glyph in glyphs],
+                 file_path, **options)
+    return file_path
+
+def _render_page(proof_glyphs, file_path, options):
+    render_sheet(proof_glyphs, file_path, **options)
+    return file_path
+
+def render_proofs(font, directory, glyph_names=None, columns=12, rows=12, overlays=(),
+                  jobs=1, prefix='proof', **options):
+    """ Renders glyphs of a font to PNG proof sheets.
+
+    Pages are rendered by many processes if jobs is not 1. If font is a path
+    of UFO format font data, each process reads the outlines from the
+    FontSnapshot cache of the font, so only glyph indexes are sent to it.
+
+    Args:
+        font:: RFont or str
+            The RFont object, or a path of UFO format font data.
+        directory:: str
+            A directory to write the PNG files to. It is made if not exists.
+        glyph_names:: [str, str, ...] (default is None)
+            Names of glyphs to render in order. Every glyph is rendered if
+            it is None.
+        columns, rows:: int (default is 12)
+            Number of glyphs in a row, and rows in a page.
+        overlays:: (str, str, ...) (default is ())
+            Keys of point attributes to label. For example, OVERLAYS.
+        jobs:: int (default is 1)
+            The number of processes. If it is None, uses every CPU.
+        prefix:: str (default is 'proof')
+            Files are named as {prefix}-0001.png, {prefix}-0002.png, ...
+        options:: keyword arguments
+            cell_size, dpi, y_range and show_points of render_sheet().
+
+    Examples:
+        from fwig.tools import plot
+
+        plot.render_proofs('Yullyeo.ufo', 'proofs', jobs=None, overlays=plot.OVERLAYS)
+
+    Returns:
+        file paths:: [str, str, ...]
+            Paths of the PNG files in order of pages.
+    """
+    os.makedirs(directory, exist_ok=True)
+    per_page = columns * rows
+    options = dict(options, columns=columns)
+    if isinstance(font, str):
+        snapshot = _open_worker_snapshot(font)
+        if glyph_names is None:
+            glyph_names = snapshot.glyph_names
+        items = [snapshot.glyph_index(name) for name in glyph_names]
+    else:
+        if glyph_names is None:
+            glyph_names = [name for name in font.glyphOrder if name in font] \
+                          or sorted(font.keys())
+        items = glyph_names
+
+    pages = []
+    for page_number, start in enumerate(range(0, len(items), per_page)):
+        file_path = os.path.join(directory, f'{prefix}-{page_number+1:04d}.png')
+        page = items[start:start+per_page]
+        if isinstance(font, str):
+            pages.append((_render_snapshot_page, (font, page, file_path, overlays, options)))
+        else:
+            pages.append((_render_page, ([proof_glyph(font[name], overlays) for name in page],
+                                         file_path, options)))
+
+    if jobs == 1:
+        return [function(*args) for function, args in pages]
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        futures = [executor.submit(function, *args) for function, args in pages]
+        return [future.result() for future in futures]
 
 def plot_rglyph(rglyph, show_points=True):
     """ Plotting RGlyph object.
@@ -48,17 +368,15 @@ def plot_rglyph(rglyph, show_points=True):
     Args:
         rglyph:: RGlyph
     """
-    subplot = plt.subplot(xlim=(0, glyph.width), ylim=(0, 1000)) # TODO: Needs modify
-    for contour in glyph.contours:
-        points = contour.points
-        # TODO: Needs plot clockwise
-        for idx, point in enumerate(points):
-            if point.type == 'line':
-                plot_line(subplot, [points[idx+i] for i in range(-1, 1)], show_points)
-            elif point.type == 'curve':
-                plot_curve(subplot, [points[idx+i] for i in range(-3, 1)], show_points)
-            else:
-                continue
+    subplot = plt.subplot(xlim=(0, rglyph.width), ylim=(0, 1000)) # TODO: Needs modify
+    # TODO: Needs plot clockwise
+    glyph = proof_glyph(rglyph)
+    subplot.add_patch(PathPatch(Path(glyph.vertices, glyph.codes), facecolor='none',
+                                edgecolor=sns.xkcd_rgb['denim blue']))
+    if show_points:
+        for contour in rglyph.contours:
+            for segment in bt.get_segments(contour):
+                _plot_points(subplot, segment.nodes)
     plt.show()
 
 def plot_glif(glyph_path, show_points=True):
@@ -67,30 +385,16 @@ def plot_glif(glyph_path, show_points=True):
     Args:
         glyph_path:: str
     """
-    class _Point:
-        def __init__(self, x, y, type_):
-            self.x = x
-            self.y = y
-            self.type = type_
-    # subplot = plt.subplot(xlim=(0, xml_glyph.find('advance').attrib['width']), 
-                          # ylim=(0, 1000)) # TODO: Needs modify
-    xml_glyph = et.parse(glyph_path).getroot()
-    contours = xml_glyph.find('outline').getchildren()
-    curve_points = [_Point(p.attrib['x'], p.attrib['y'], p.attrib.get('type')) \
-                    for p in contours[0].getchildren()[:4]]
-    nodes = np.asfortranarray([
-        [float(p.x) for p in curve_points],
-        [float(p.y) for p in curve_points]])
-    subplot = bezier.Curve(nodes, degree=3).plot(100) # TODO: width
-    for contour in contours:
-        points = [_Point(p.attrib['x'], p.attrib['y'], p.attrib.get('type')) \
-                  for p in contour.getchildren()]
-        for idx, point in enumerate(points):
-            if point.type == 'line':
-                plot_line(subplot, [points[idx+i] for i in range(-1, 1)], show_points)
-            elif point.type == 'curve':
-                plot_curve(subplot, [points[idx+i] for i in range(-3, 1)], show_points)
-            else:
-                continue
+    glyph = glif.read_file(glyph_path)
+    subplot = plt.subplot(xlim=(0, glyph.width or 1000), ylim=(0, 1000)) # TODO: Needs modify
+    vertices, codes = outline_path(glyph.coordinates, glyph.types, glyph.contour_lengths)
+    subplot.add_patch(PathPatch(Path(vertices, codes), facecolor='none',
+                                edgecolor=sns.xkcd_rgb['denim blue']))
+    if show_points:
+        is_point = codes != Path.CLOSEPOLY
+        is_off_curve = _control_points(codes)
+        subplot.plot(*vertices[is_point & ~is_off_curve].T, marker='s', linestyle='None',
+                     color=sns.xkcd_rgb['pale red'])
+        subplot.plot(*vertices[is_off_curve].T, marker='.', linestyle='None',
+                     color=sns.xkcd_rgb['pale red'])
     plt.show()
-
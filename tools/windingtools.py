@@ -0,0 +1,195 @@
+""" Font tools for checking many positions against a glyph at once.
+
+Segments of a glyph are split at their turning points in y into monotone
+pieces. A ray from each position to +x crosses a piece at most once, so the
+winding numbers of every position around every contour are computed with
+array operations over positions and pieces, exactly on the curves.
+
+Pieces are cached per glyph until the glyph changes.
+
+Last modified date: 2026/10/18
+
+Created by Seongju Woo.
+"""
+import numpy as np
+from fwig.tools import beziertools as bt
+from fwig.tools.glyphcache import GlyphCache
+
+_ITERATIONS = 40
+
+# Positions(x pieces) are handled by chunks of this size to bound memory.
+_CHUNK_SIZE = 1 << 20
+
+def _turning_points(c_3, c_2, c_1):
+    a_value, b_value, c_value = 3*c_3, 2*c_2, c_1
+    if abs(a_value) < 1e-12:
+        roots = [-c_value / b_value] if abs(b_value) > 1e-12 else []
+    else:
+        discriminant = b_value*b_value - 4*a_value*c_value
+        if discriminant < 0:
+            return []
+        root = discriminant ** 0.5
+        roots = [(-b_value - root) / (2*a_value), (-b_value + root) / (2*a_value)]
+    return sorted(t_value for t_value in roots if 0 < t_value < 1)
+
+def _power_coefficients(values):
+    if len(values) == 2:
+        return [0., 0., values[1] - values[0], values[0]]
+    p_0, p_1, p_2, p_3 = values
+    return [-p_0 + 3*p_1 - 3*p_2 + p_3, 3*p_0 - 6*p_1 + 3*p_2, -3*p_0 + 3*p_1, p_0]
+
+def _evaluate(coefficients, t_values):
+    return ((coefficients[..., 0]*t_values + coefficients[..., 1])*t_values
+            + coefficients[..., 2])*t_values + coefficients[..., 3]
+
+
+class MonotonePieces:
+    """ Pieces of segments of a glyph that are monotone in y.
+
+    Args:
+        glyph:: RGlyph
+            The RGlyph object.
+
+    Attributes:
+        x_coefficients, y_coefficients:: numpy.ndarray (float, K x 4)
+            Power coefficients(highest first) of x(t) and y(t) of the
+            segment of each piece.
+        t_starts, t_ends:: numpy.ndarray (float, K)
+            Parameter range of each piece.
+        y_starts, y_ends:: numpy.ndarray (float, K)
+            y at both ends of each piece.
+        x_mins, x_maxs:: numpy.ndarray (float, K)
+            x range of nodes of the segment of each piece.
+        contour_numbers:: numpy.ndarray (int, K)
+            Index of contour of each piece.
+        contour_count:: int
+    """
+    def __init__(self, glyph):
+        x_coefficients, y_coefficients, ranges, x_ranges, contour_numbers = [], [], [], [], []
+        contours = glyph.contours
+        for contour_index, contour in enumerate(contours):
+            for segment in bt.get_segments(contour):
+                x_polynomial = _power_coefficients(segment.nodes[0].tolist())
+                y_polynomial = _power_coefficients(segment.nodes[1].tolist())
+                t_values = [0.] + _turning_points(*y_polynomial[:3]) + [1.]
+                for t_start, t_end in zip(t_values[:-1], t_values[1:]):
+                    x_coefficients.append(x_polynomial)
+                    y_coefficients.append(y_polynomial)
+                    ranges.append((t_start, t_end))
+                    x_ranges.append((segment.nodes[0].min(), segment.nodes[0].max()))
+                    contour_numbers.append(contour_index)
+        self.contour_count = len(contours)
+        self.x_coefficients = np.array(x_coefficients, dtype=float).reshape(-1, 4)
+        self.y_coefficients = np.array(y_coefficients, dtype=float).reshape(-1, 4)
+        self.t_starts, self.t_ends = np.array(ranges, dtype=float).reshape(-1, 2).T
+        self.x_mins, self.x_maxs = np.array(x_ranges, dtype=float).reshape(-1, 2).T
+        self.y_starts = _evaluate(self.y_coefficients, self.t_starts)
+        self.y_ends = _evaluate(self.y_coefficients, self.t_ends)
+        self.contour_numbers = np.array(contour_numbers, dtype=int)
+
+    def windings(self, positions):
+        """ Winding numbers of positions around each contour.
+
+        Args:
+            positions:: numpy.ndarray (float, P x 2)
+                Positions to check.
+
+        Returns:
+            windings:: numpy.ndarray (int, P x C)
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        windings = np.zeros((len(positions), self.contour_count), dtype=int)
+        size = max(1, _CHUNK_SIZE // max(1, len(self.t_starts)))
+        for offset in range(0, len(positions), size):
+            chunk = positions[offset:offset+size]
+            x_values, y_values = chunk[:, 0:1], chunk[:, 1:2]
+
+            # Half-open rule in y, so a crossing at an end is counted once.
+            is_upward = (self.y_starts <= y_values) & (y_values < self.y_ends)
+            is_downward = (self.y_ends <= y_values) & (y_values < self.y_starts)
+            is_candidate = (is_upward | is_downward) & (x_values < self.x_maxs)
+            rows, pieces = np.nonzero(is_candidate)
+            directions = np.where(is_upward[rows, pieces], 1, -1)
+
+            # Pieces entirely at the right of the position cross the ray, and
+            # the others are solved by bisection on the monotone y(t).
+            is_crossing = self.x_mins[pieces] > chunk[rows, 0]
+            unsure = np.flatnonzero(~is_crossing)
+            if len(unsure):
+                is_crossing[unsure] = self._crossing_x(pieces[unsure], chunk[rows[unsure], 1]) \
+                                      > chunk[rows[unsure], 0]
+            np.add.at(windings, (offset + rows[is_crossing], self.contour_numbers[pieces[is_crossing]]),
+                      directions[is_crossing])
+        return windings
+
+    def _crossing_x(self, pieces, y_values):
+        y_coefficients = self.y_coefficients[pieces]
+        t_starts, t_ends = self.t_starts[pieces].copy(), self.t_ends[pieces].copy()
+        is_rising = self.y_ends[pieces] > self.y_starts[pieces]
+        for _ in range(_ITERATIONS):
+            t_middles = (t_starts + t_ends) / 2
+            is_below = _evaluate(y_coefficients, t_middles) < y_values
+            is_after = is_below == is_rising
+            t_starts = np.where(is_after, t_middles, t_starts)
+            t_ends = np.where(is_after, t_ends, t_middles)
+        return _evaluate(self.x_coefficients[pieces], (t_starts + t_ends) / 2)
+
+_pieces = GlyphCache(MonotonePieces)
+
+def get_pieces(glyph):
+    """ Gets the MonotonePieces of RGlyph object.
+
+    The pieces are cached until the glyph changes.
+    """
+    return _pieces.get(glyph)
+
+def windings(glyph, positions):
+    """ Winding numbers of positions around each contour of the glyph.
+
+    Args:
+        glyph:: RGlyph
+            The RGlyph object.
+        positions:: numpy.ndarray (float, P x 2)
+            Positions to check.
+
+    Returns:
+        windings:: numpy.ndarray (int, P x C)
+    """
+    return get_pieces(glyph).windings(positions)
+
+def inside_contours(glyph, positions, exclude_contour=None):
+    """ Checks whether positions are inside each contour of the glyph.
+
+    Every check of a glyph can be done by a single call. The nonzero winding
+    rule is used like contour.pointInside(), and positions exactly on an
+    outline may be either inside or outside.
+
+    Args:
+        glyph:: RGlyph
+            The RGlyph object.
+        positions:: numpy.ndarray (float, P x 2)
+            Positions to check.
+        exclude_contour:: int or RContour (default is None)
+            Index of contour(or the contour) to regard as not containing
+            any position.
+
+    Examples:
+        import numpy as np
+        from fontParts.world import CurrentGlyph
+        from fwig.tools import windingtools as wt
+
+        glyph = CurrentGlyph()
+        positions = np.array([point.position for point in glyph.contours[0].points])
+        insides = wt.inside_contours(glyph, positions, exclude_contour=0)
+        insides.any(axis=1)     # Whether each position is inside other contours.
+
+    Returns:
+        insides:: numpy.ndarray (bool, P x C)
+            insides[i, j] is True if positions[i] is inside contour j.
+    """
+    insides = windings(glyph, positions) != 0
+    if exclude_contour is not None:
+        if not isinstance(exclude_contour, int):
+            exclude_contour = exclude_contour.index
+        insides[:, exclude_contour] = False
+    return insides